@@ -1,6 +1,9 @@
 import sys
+from typing import Callable
 import pygame
-from maze import GOAL, START, WEIGHT, Maze, State
+from maze import GOAL, SEARCHES, START, WEIGHT, Maze, State
+from pathfinder.compare import Job, JobBatch, Metrics, aggregate, beam_width_jobs, best_width, make_jobs
+from pathfinder.generate import GENERATORS, generate
 
 from widgets import (
     Alignment, Button, Label, Menu, Orientation, Popup, Table, TableCell, Animation, Animator, AnimatingNode, MazeGenerator,
@@ -8,208 +11,6 @@ from widgets import (
     GRAY, GREEN, GREEN_2, HEADER_HEIGHT, BLUE_2, MIN_SIZE, SEARCH_ALGORITHMS, WHITE, WIDTH, HEIGHT, FPS, YELLOW
 )
 
-# Initialize PyGame
-pygame.init()
-
-# Set up window
-WINDOW = pygame.display.set_mode((WIDTH, HEIGHT), pygame.HWACCEL)
-pygame.display.set_caption("Pathfinding Visualiser")
-
-# Top bar
-top = pygame.Rect(0, 0, WIDTH, 80)
-
-# Title
-title = Label(
-    # "Pathfinding Visualiser", 
-    "",
-    20, 0,
-    background_color=pygame.Color(*DARK_BLUE),
-    foreground_color=pygame.Color(*WHITE),
-    padding=6, font_size=20, bold=True,
-    surface=WINDOW,
-)
-title.rect.centery = top.centery
-
-# Instantiate Maze and Animator
-state = State()
-maze = Maze(surface=WINDOW)
-animator = Animator(surface=WINDOW, maze=maze)
-maze_generator = MazeGenerator(animator=animator)
-maze.animator = animator
-maze.generator = maze_generator
-
-
-# Algorithms list
-algorithm_btn = Button(
-    surface=WINDOW,
-    text="Algorithms",
-    x=title.width + 70,
-    y=0,
-    background_color=pygame.Color(*DARK_BLUE),
-    foreground_color=pygame.Color(*WHITE),
-    font_size=20, outline=False
-)
-algorithm_btn.rect.centery = top.centery
-
-
-algo_menu = Menu(
-    surface=WINDOW,
-    button=algorithm_btn,
-    children=[
-        Button(
-            surface=WINDOW,
-            text=search,
-            x=algorithm_btn.rect.x - 40,
-            y=algorithm_btn.rect.y + algorithm_btn.height * 5,
-            background_color=pygame.Color(*DARK_BLUE),
-            foreground_color=pygame.Color(*WHITE),
-            font_size=20, outline=False
-        ) for search in SEARCH_ALGORITHMS
-    ]
-)
-
-speed_btn = Button(
-    surface=WINDOW,
-    text="Speed",
-    x=algorithm_btn.rect.right + 40,
-    y=0,
-    background_color=pygame.Color(*DARK_BLUE),
-    foreground_color=pygame.Color(*WHITE),
-    font_size=20, outline=False
-)
-speed_btn.rect.centery = top.centery
-speed_btn.rect.y -= 15
-
-
-speed_menu = Menu(
-    surface=WINDOW,
-    button=speed_btn,
-    children=[
-        Button(
-            surface=WINDOW,
-            text="Fast",
-            x=0,
-            y=0,
-            background_color=pygame.Color(*DARK_BLUE),
-            foreground_color=pygame.Color(*WHITE),
-            font_size=20, outline=False
-        ) for speed in ("Fast", "Medium", "Slow")
-    ]
-)
-
-beam_width_btn = Button(
-    surface=WINDOW,
-    text="Beam Width",
-    x=speed_btn.rect.right + 40,
-    y=0,
-    background_color=pygame.Color(*DARK_BLUE),
-    foreground_color=pygame.Color(*WHITE),
-    font_size=20, outline=False
-)
-beam_width_btn.rect.centery = top.centery
-beam_width_btn.rect.y -= 15
-
-beam_width_menu = Menu(
-    surface=WINDOW,
-    button=beam_width_btn,
-    children=[
-        Button(
-            surface=WINDOW,
-            text=str(beam_width),
-            x=0,
-            y=0,
-            background_color=pygame.Color(*DARK_BLUE),
-            foreground_color=pygame.Color(*WHITE),
-            font_size=20, outline=False
-        ) for beam_width in BEAM_WIDTH_LIST
-    ]
-)
-
-# Button instance for VISUALISE button
-visualise_btn = Button(
-    "VISUALISE", "center", 0,
-    background_color=pygame.Color(*GREEN),
-    foreground_color=pygame.Color(*WHITE),
-    padding=6, font_size=20, outline=False,
-    surface=WINDOW,
-)
-visualise_btn.rect.centery = top.centery
-
-#
-compare_btn = Button(
-    "Run All    ", 0, 0,
-    background_color=pygame.Color(*DARK_BLUE),
-    foreground_color=pygame.Color(*WHITE),
-    font_size=20, outline=False,
-    surface=WINDOW,
-)
-compare_btn.rect.centery = top.centery
-compare_btn.rect.left = visualise_btn.rect.right + 50
-
-comapre_menu = Menu(
-    surface=WINDOW,
-    button=compare_btn,
-    children=[
-        Button(
-            surface=WINDOW,
-            text="Current Maze",
-            x=0,
-            y=0,
-            background_color=pygame.Color(*DARK_BLUE),
-            foreground_color=pygame.Color(*WHITE),
-            font_size=20, outline=False
-        ),
-        Button(
-            surface=WINDOW,
-            text="Different Mazes",
-            x=0,
-            y=0,
-            background_color=pygame.Color(*DARK_BLUE),
-            foreground_color=pygame.Color(*WHITE),
-            font_size=20, outline=False
-        ),
-    ]
-)
-
-generate_btn = Button(
-    "Generate Maze", 0, 0,
-    background_color=pygame.Color(*DARK_BLUE),
-    foreground_color=pygame.Color(*WHITE),
-    font_size=20, outline=False,
-    surface=WINDOW,
-)
-generate_btn.rect.centery = top.centery
-generate_btn.rect.left = compare_btn.rect.right + 50
-
-
-generate_menu = Menu(
-    surface=WINDOW,
-    button=generate_btn,
-    children=[
-         Button(
-            surface=WINDOW,
-            text=generate_type,
-            x=generate_btn.rect.x - 40,
-            y=generate_btn.rect.y + generate_btn.height,
-            background_color=pygame.Color(*DARK_BLUE),
-            foreground_color=pygame.Color(*WHITE),
-            font_size=20, outline=False
-        ) for generate_type in GENERATE_MAZE_TYPE
-    ]
-)
-
-
-# Button instance for Clear button
-clear_btn = Button(
-    "Clear Walls", 0, 0,
-    background_color=pygame.Color(*DARK_BLUE),
-    foreground_color=pygame.Color(*WHITE),
-    padding=6, font_size=20, outline=False,
-    surface=WINDOW,
-)
-clear_btn.rect.centery = top.centery
-clear_btn.rect.right = WIDTH - 20
-
 
 def main() -> None:
     """Start here"""
@@ -259,6 +60,8 @@ def main() -> None:
         # Handle events
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                if state.batch:
+                    state.batch.cancel()
                 pygame.quit()
                 sys.exit()
 
@@ -297,7 +100,7 @@ def main() -> None:
                         break
 
                     maze.set_cell((row, col), cell_value)
-                    maze.set_cell(cell_under_mouse, "1")
+                    maze.set_cell(cell_under_mouse, str(maze.get_node(cell_under_mouse).cost))
 
                 cell_under_mouse = (-1, -1)
 
@@ -350,8 +153,15 @@ def main() -> None:
 
                     cell_under_mouse = (row, col)
 
+        # Feed the animator from a search that is still running
+        maze.pump()
+
+        # Show the results of a comparison running in the background
+        if state.batch and state.batch.poll():
+            state.batch = None
+
         # Animate nodes
-        if animator.nodes_to_animate and state.need_update:
+        if (animator.nodes_to_animate or maze.stream) and state.need_update:
             animator.animating = True
             animator.animate_nodes()
         else:
@@ -375,10 +185,12 @@ def main() -> None:
 
                 if cell_under_mouse != (row, col):
                     maze.set_cell((row, col), cell_value)
-                    maze.set_cell(cell_under_mouse, "1")
+                    maze.set_cell(cell_under_mouse, str(maze.get_node(cell_under_mouse).cost))
 
                     text = state.label.text.split(" took")[0]
-                    instant_algorithm(maze, text)
+                    text = text.split("Running ")[-1]
+                    text = text.split(" cost")[0]
+                    instant_algorithm(maze, text, moving_start=cell_value == "A")
                     cell_under_mouse = (row, col)
 
         # Update
@@ -386,12 +198,12 @@ def main() -> None:
         CLOCK.tick(FPS)
 
 
-def instant_algorithm(maze: Maze, algo_name: str):
+def instant_algorithm(maze: Maze, algo_name: str, moving_start: bool = False):
 
     maze.clear_visited()
     beam_width = int(state.beam_width_label.text)
-    print(f"Running {algo_name} with beam width {beam_width}")
-    solution = maze.solve(algo_name=algo_name, beam_width=beam_width)
+    solution = maze.solve(algo_name=algo_name, beam_width=beam_width,
+                          moving_start=moving_start)
 
     path = solution.path
     explored = solution.explored
@@ -567,6 +379,12 @@ def draw() -> None:
             state.run_all_mazes = True
             state.results = {}
             run_all(0)
+        elif comapre_menu.selected \
+                and comapre_menu.selected.text == "Headless":
+            run_headless()
+        elif comapre_menu.selected \
+                and comapre_menu.selected.text == "Beam Sweep":
+            run_beam_sweep()
 
     if (generate_menu.draw() or generate_menu.clicked) \
             and not animator.animating:
@@ -622,9 +440,12 @@ def run_single(idx: int) -> None:
     maze.clear_visited()
     algo_name = algo_menu.children[idx].text
     beam_width = int(state.beam_width_label.text)
-    solution = maze.solve(algo_name=algo_name, beam_width=beam_width)
+
+    # The search runs while it is animated, frame by frame
+    stream = maze.stream_solve(algo_name=algo_name, beam_width=beam_width)
 
     def callback():
+        solution = stream.solution
         state.done_visualising = True
         state.label = Label(
             f"{algo_name} cost {solution.path_cost} in "
@@ -637,7 +458,7 @@ def run_single(idx: int) -> None:
         state.label.rect.bottom = HEADER_HEIGHT - 10
         state.overlay = False
 
-    maze.visualize(solution=solution, after_animation=callback)
+    maze.visualize_stream(stream=stream, after_animation=callback)
 
     state.label = Label(
         f"Running {algo_name}", "center", 0,
@@ -713,8 +534,9 @@ def run_all(algo_idx: int, maze_idx: int = -1) -> None:
 
     solution = maze.solve(text)
 
+    # Keep only the metrics, not the cells of every run
     if text not in state.results:
-        state.results[text] = vars(solution)
+        state.results[text] = solution.summary()
     else:
         state.results[text]["explored_length"] += solution.explored_length
         state.results[text]["path_length"] += solution.path_length
@@ -733,12 +555,95 @@ def run_all(algo_idx: int, maze_idx: int = -1) -> None:
     state.label.rect.bottom = HEADER_HEIGHT - 10
 
 
-def show_results(results: list[tuple[str, dict[str, float]]]) -> None:
+def run_headless() -> None:
+
+    # Run every algorithm on the current maze and on a maze from every
+    # generator, like "Different Mazes", in a process pool without
+    # animations. The main loop polls the pool and shows the averaged
+    # table once all are done
+    maze.clear_visited()
+    beam_width = int(state.beam_width_label.text)
+    searches = {btn.text: SEARCHES[btn.text.strip()] for btn in algo_menu.children}
+
+    grids = [maze.grid]
+    for algorithm in GENERATORS:
+        grids.append(generate(algorithm, maze.width, maze.height,
+                              maze.start, maze.goal).grid())
+
+    def callback(results: list[tuple[str, Metrics]]) -> None:
+        show_results(aggregate(results))
+
+    run_in_background(make_jobs(searches, grids, beam_width),
+                      "Running headless comparison", callback)
+
+
+def run_beam_sweep() -> None:
+
+    # Run Local Beam Search once per beam width on the current maze,
+    # in a process pool, and highlight the best width in the table
+    maze.clear_visited()
+
+    def callback(results: list[tuple[str, Metrics]]) -> None:
+        best = best_width(results)
+        show_results(
+            results,
+            title="BEAM WIDTH SWEEP" if best is None
+            else f"BEAM WIDTH SWEEP, BEST WIDTH {best}",
+            heading="Beam Width",
+            best=best or "",
+        )
+
+    run_in_background(beam_width_jobs(maze.grid, BEAM_WIDTH_LIST),
+                      "Running beam width sweep", callback)
+
+
+def run_in_background(
+    jobs: list[Job],
+    text: str,
+    show: Callable[[list[tuple[str, Metrics]]], None],
+) -> None:
+
+    # Keep the overlay up and the frames coming while the pool works,
+    # one comparison at a time
+    if state.batch:
+        return
+    previous = state.label.text
+
+    def callback(results: list[tuple[str, Metrics]]) -> None:
+        state.label = Label(
+            previous, "center", 0,
+            background_color=pygame.Color(*WHITE),
+            foreground_color=pygame.Color(*DARK),
+            padding=6, font_size=20, outline=False,
+            surface=WINDOW,
+        )
+        state.label.rect.bottom = HEADER_HEIGHT - 10
+        show(results)
+        state.overlay = False
+
+    state.label = Label(
+        text, "center", 0,
+        background_color=pygame.Color(*WHITE),
+        foreground_color=pygame.Color(*DARK),
+        padding=6, font_size=20, outline=False,
+        surface=WINDOW,
+    )
+    state.label.rect.bottom = HEADER_HEIGHT - 10
+    state.batch = JobBatch(jobs, on_finish=callback)
+
+
+def show_results(
+    results: list[tuple[str, dict[str, float]]],
+    title: str = "COMPARISON RESULTS",
+    heading: str = "Algorithm",
+    best: str | None = None,
+) -> None:
+    # Without best the rows are ranked, with it only that row is highlighted
     children: list[list[TableCell]] = []
     children.append([
         TableCell(
             child=Label(
-                    "Algorithm", 0, 0,
+                    heading, 0, 0,
                     background_color=pygame.Color(*DARK_BLUE),
                     foreground_color=pygame.Color(*WHITE),
                     padding=6, font_size=20, outline=False,
@@ -788,14 +693,19 @@ def show_results(results: list[tuple[str, dict[str, float]]]) -> None:
         ),
     ])
 
-    colors = [GREEN_2, GREEN_2, YELLOW, YELLOW]
-    colors.extend([GRAY] * (len(results) - 4))
+    if best is None:
+        colors = [GREEN_2, GREEN_2, YELLOW, YELLOW]
+        colors.extend([GRAY] * (len(results) - 4))
+        labels = [f"{i + 1}. {result[0]}" for i, result in enumerate(results)]
+    else:
+        colors = [GREEN_2 if result[0] == best else GRAY for result in results]
+        labels = [result[0] for result in results]
 
     for i, result in enumerate(results):
         children.append([
             TableCell(
                 child=Label(
-                        f"{i + 1}. {result[0]}", 0, 0,
+                        labels[i], 0, 0,
                         background_color=pygame.Color(*colors[i]),
                         foreground_color=pygame.Color(*DARK),
                         padding=6, font_size=20, outline=False,
@@ -861,7 +771,7 @@ def show_results(results: list[tuple[str, dict[str, float]]]) -> None:
         y_align=Alignment.CENTER,
         children=[
             Label(
-                "COMPARISON RESULTS", 0, 0,
+                title, 0, 0,
                 background_color=pygame.Color(*DARK),
                 foreground_color=pygame.Color(*WHITE),
                 padding=10, font_size=20, outline=False,
@@ -870,7 +780,7 @@ def show_results(results: list[tuple[str, dict[str, float]]]) -> None:
             Table(
                 x=0,
                 y=0,
-                rows=3,
+                rows=len(children),
                 columns=5,
                 padding=20,
                 color=DARK,
@@ -885,4 +795,226 @@ def show_results(results: list[tuple[str, dict[str, float]]]) -> None:
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Only the script builds the window, so pool workers that import this
+    # module do not start pygame
+    # Initialize PyGame
+    pygame.init()
+
+    # Set up window
+    WINDOW = pygame.display.set_mode((WIDTH, HEIGHT), pygame.HWACCEL)
+    pygame.display.set_caption("Pathfinding Visualiser")
+
+    # Top bar
+    top = pygame.Rect(0, 0, WIDTH, 80)
+
+    # Title
+    title = Label(
+        # "Pathfinding Visualiser", 
+        "",
+        20, 0,
+        background_color=pygame.Color(*DARK_BLUE),
+        foreground_color=pygame.Color(*WHITE),
+        padding=6, font_size=20, bold=True,
+        surface=WINDOW,
+    )
+    title.rect.centery = top.centery
+
+    # Instantiate Maze and Animator
+    state = State()
+    maze = Maze(surface=WINDOW)
+    animator = Animator(surface=WINDOW, maze=maze)
+    maze_generator = MazeGenerator(animator=animator)
+    maze.animator = animator
+    maze.generator = maze_generator
+
+
+    # Algorithms list
+    algorithm_btn = Button(
+        surface=WINDOW,
+        text="Algorithms",
+        x=title.width + 70,
+        y=0,
+        background_color=pygame.Color(*DARK_BLUE),
+        foreground_color=pygame.Color(*WHITE),
+        font_size=20, outline=False
+    )
+    algorithm_btn.rect.centery = top.centery
+
+
+    algo_menu = Menu(
+        surface=WINDOW,
+        button=algorithm_btn,
+        children=[
+            Button(
+                surface=WINDOW,
+                text=search,
+                x=algorithm_btn.rect.x - 40,
+                y=algorithm_btn.rect.y + algorithm_btn.height * 5,
+                background_color=pygame.Color(*DARK_BLUE),
+                foreground_color=pygame.Color(*WHITE),
+                font_size=20, outline=False
+            ) for search in SEARCH_ALGORITHMS
+        ]
+    )
+
+    speed_btn = Button(
+        surface=WINDOW,
+        text="Speed",
+        x=algorithm_btn.rect.right + 40,
+        y=0,
+        background_color=pygame.Color(*DARK_BLUE),
+        foreground_color=pygame.Color(*WHITE),
+        font_size=20, outline=False
+    )
+    speed_btn.rect.centery = top.centery
+    speed_btn.rect.y -= 15
+
+
+    speed_menu = Menu(
+        surface=WINDOW,
+        button=speed_btn,
+        children=[
+            Button(
+                surface=WINDOW,
+                text="Fast",
+                x=0,
+                y=0,
+                background_color=pygame.Color(*DARK_BLUE),
+                foreground_color=pygame.Color(*WHITE),
+                font_size=20, outline=False
+            ) for speed in ("Fast", "Medium", "Slow")
+        ]
+    )
+
+    beam_width_btn = Button(
+        surface=WINDOW,
+        text="Beam Width",
+        x=speed_btn.rect.right + 40,
+        y=0,
+        background_color=pygame.Color(*DARK_BLUE),
+        foreground_color=pygame.Color(*WHITE),
+        font_size=20, outline=False
+    )
+    beam_width_btn.rect.centery = top.centery
+    beam_width_btn.rect.y -= 15
+
+    beam_width_menu = Menu(
+        surface=WINDOW,
+        button=beam_width_btn,
+        children=[
+            Button(
+                surface=WINDOW,
+                text=str(beam_width),
+                x=0,
+                y=0,
+                background_color=pygame.Color(*DARK_BLUE),
+                foreground_color=pygame.Color(*WHITE),
+                font_size=20, outline=False
+            ) for beam_width in BEAM_WIDTH_LIST
+        ]
+    )
+
+    # Button instance for VISUALISE button
+    visualise_btn = Button(
+        "VISUALISE", "center", 0,
+        background_color=pygame.Color(*GREEN),
+        foreground_color=pygame.Color(*WHITE),
+        padding=6, font_size=20, outline=False,
+        surface=WINDOW,
+    )
+    visualise_btn.rect.centery = top.centery
+
+    #
+    compare_btn = Button(
+        "Run All    ", 0, 0,
+        background_color=pygame.Color(*DARK_BLUE),
+        foreground_color=pygame.Color(*WHITE),
+        font_size=20, outline=False,
+        surface=WINDOW,
+    )
+    compare_btn.rect.centery = top.centery
+    compare_btn.rect.left = visualise_btn.rect.right + 50
+
+    comapre_menu = Menu(
+        surface=WINDOW,
+        button=compare_btn,
+        children=[
+            Button(
+                surface=WINDOW,
+                text="Current Maze",
+                x=0,
+                y=0,
+                background_color=pygame.Color(*DARK_BLUE),
+                foreground_color=pygame.Color(*WHITE),
+                font_size=20, outline=False
+            ),
+            Button(
+                surface=WINDOW,
+                text="Different Mazes",
+                x=0,
+                y=0,
+                background_color=pygame.Color(*DARK_BLUE),
+                foreground_color=pygame.Color(*WHITE),
+                font_size=20, outline=False
+            ),
+            Button(
+                surface=WINDOW,
+                text="Headless",
+                x=0,
+                y=0,
+                background_color=pygame.Color(*DARK_BLUE),
+                foreground_color=pygame.Color(*WHITE),
+                font_size=20, outline=False
+            ),
+            Button(
+                surface=WINDOW,
+                text="Beam Sweep",
+                x=0,
+                y=0,
+                background_color=pygame.Color(*DARK_BLUE),
+                foreground_color=pygame.Color(*WHITE),
+                font_size=20, outline=False
+            ),
+        ]
+    )
+
+    generate_btn = Button(
+        "Generate Maze", 0, 0,
+        background_color=pygame.Color(*DARK_BLUE),
+        foreground_color=pygame.Color(*WHITE),
+        font_size=20, outline=False,
+        surface=WINDOW,
+    )
+    generate_btn.rect.centery = top.centery
+    generate_btn.rect.left = compare_btn.rect.right + 50
+
+
+    generate_menu = Menu(
+        surface=WINDOW,
+        button=generate_btn,
+        children=[
+             Button(
+                surface=WINDOW,
+                text=generate_type,
+                x=generate_btn.rect.x - 40,
+                y=generate_btn.rect.y + generate_btn.height,
+                background_color=pygame.Color(*DARK_BLUE),
+                foreground_color=pygame.Color(*WHITE),
+                font_size=20, outline=False
+            ) for generate_type in GENERATE_MAZE_TYPE
+        ]
+    )
+
+
+    # Button instance for Clear button
+    clear_btn = Button(
+        "Clear Walls", 0, 0,
+        background_color=pygame.Color(*DARK_BLUE),
+        foreground_color=pygame.Color(*WHITE),
+        padding=6, font_size=20, outline=False,
+        surface=WINDOW,
+    )
+    clear_btn.rect.centery = top.centery
+    clear_btn.rect.right = WIDTH - 20
+
+    main()
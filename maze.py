@@ -1,14 +1,33 @@
 import random
-from typing import Optional
+from typing import Iterable, Optional
 import pygame
+from pathfinder.compare import JobBatch
 from pathfinder.models import Solution, Node, Search, Grid
 from pathfinder.PathFinder import PathFinder
+from pathfinder.stream import SearchStream
 from widgets import (
     Label, Popup, AnimatingNode, Animation, AnimationCallback, Animator, GenerationCallback, MazeGenerator,
     CELL_WEIGHTS, DARK_BLUE_2, GOAL, HEIGHT, MIN_SIZE, REMAINDER_H, REMAINDER_W, START, WEIGHT,
     CELL_SIZE, FONT_14, GRAY, GREEN_2, MAZE_HEIGHT, HEADER_HEIGHT, MAZE_WIDTH, BLUE_2, WIDTH, BLUE, DARK, WHITE, GREEN, YELLOW
 )
 
+# How far ahead of the animation a streamed search may run, in ms
+STREAM_LOOKAHEAD = 250
+
+# String -> Search Algorithm
+SEARCHES: dict[str, Search] = {
+    "Breadth First Search": Search.BREADTH_FIRST_SEARCH,
+    "Local Beam Search": Search.LOCAL_BEAM_SEARCH,
+    "Greedy Best First Search": Search.GREEDY_BEST_FIRST_SEARCH,
+    "Dijkstra's Algorithm": Search.DIJKSTRA,
+    "A* Algorithm": Search.A_STAR,
+    "Bidirectional BFS": Search.BIDIRECTIONAL_BFS,
+    "Jump Point Search": Search.JUMP_POINT_SEARCH,
+    "Hierarchical A*": Search.HIERARCHICAL_A_STAR,
+    "D* Lite": Search.D_STAR_LITE,
+    "Wavefront BFS": Search.WAVEFRONT_BFS,
+}
+
 class State:
     __instance = None
     
@@ -21,6 +40,7 @@ class State:
     results: dict[str, dict[str, float]]
     run_all_mazes = False
     results_popup: Popup | None = None
+    batch: JobBatch | None = None
 
     def __new__(cls):
         if State.__instance is None:
@@ -64,9 +84,10 @@ class Maze:
         self.start = (self.height // 2, start_col)
         self.goal = (self.height // 2, goal_col)
         self.maze[self.start[0]][self.start[1]].value = "A"
-        self.maze[self.start[0]][self.start[1]].cost = 0
         self.maze[self.goal[0]][self.goal[1]].value = "B"
-        self.maze[self.goal[0]][self.goal[1]].cost = 1
+
+        # Grid handed to PathFinder, kept in sync by set_cell
+        self.grid = Grid(self.maze, self.start, self.goal)  # type: ignore
 
         # Generate screen coordinates for maze
         self.coords = self._generate_coordinates()
@@ -74,6 +95,12 @@ class Maze:
         # ...
         self.speed = "Fast"
 
+        # Search being animated while it runs, see visualize_stream
+        self.stream: SearchStream | None = None
+        self.stream_until = 0
+        self.stream_last: AnimatingNode | None = None
+        self.stream_callback: Optional[AnimationCallback] = None
+
     def _generate_coordinates(self) -> list[list[tuple[int, int]]]:
         """Generate screen coordinates for maze
 
@@ -140,15 +167,17 @@ class Maze:
 
         match value:
             case "A":
+                # The endpoints keep the terrain cost, so dragging them over
+                # the board does not count as an edit of the grid
                 color = WHITE
-                cost = 0
+                cost = max(self.maze[pos[0]][pos[1]].cost, 1)
                 self.start = pos
-                self.maze[pos[0]][pos[1]].parent = None
+                self.grid.start = pos
             case "B":
                 color = WHITE
-                cost = 1
+                cost = max(self.maze[pos[0]][pos[1]].cost, 1)
                 self.goal = pos
-                self.maze[pos[0]][pos[1]].parent = None
+                self.grid.end = pos
             case "#":
                 cost = -1
                 color = DARK
@@ -165,6 +194,7 @@ class Maze:
         self.maze[pos[0]][pos[1]].value = value
         self.maze[pos[0]][pos[1]].cost = cost
         self.maze[pos[0]][pos[1]].color = color
+        self.grid.refresh(pos)
 
     def set_speed(self, speed_str: str) -> None:
         """Set visualisation speed
@@ -183,6 +213,7 @@ class Maze:
         self.maze = [[MazeNode("", (rowIdx, colIdx), random.choice(CELL_WEIGHTS))
                       for colIdx in range(self.width)]
                      for rowIdx in range(self.height)]
+        self.grid = Grid(self.maze, self.start, self.goal)  # type: ignore
 
         self.set_cell(self.start, "A", forced=True)
         self.set_cell(self.goal, "B", forced=True)
@@ -190,17 +221,16 @@ class Maze:
     def clear_visited(self) -> None:
         """Clear visited nodes
         """
-        for rowIdx in range(self.height):
-            for colIdx in range(self.width):
-                node = self.maze[rowIdx][colIdx]
-                self.maze[rowIdx][colIdx] = MazeNode(
-                    str(node.cost) if node.value in ("V", "*") else node.value,
-                    (rowIdx, colIdx),
-                    node.cost
-                )
+        # Stop a search still being animated
+        if self.stream:
+            self.stream.close()
+            self.stream = None
 
-                self.set_cell((rowIdx, colIdx),
-                              self.maze[rowIdx][colIdx].value)
+        # Searches keep their own state, so only the markers are reset
+        for row in self.maze:
+            for node in row:
+                if node.value in ("V", "*"):
+                    self.set_cell(node.state, str(node.cost))
 
         self.set_cell(self.start, "A", forced=True)
         self.set_cell(self.goal, "B", forced=True)
@@ -273,111 +303,51 @@ class Maze:
             algorithm (str): Algorithm name
         """
 
-        match algorithm:
-            case "Recursive Division":
-                self._draw_walls_around()
-                self.generator.recursive_division(
-                    1, self.width - 2, 1, self.height - 2)
-            case "Randomised DFS":
-                self.generator.randomised_dfs()
-            case "Prim's Algorithm":
-                self.generator.randomised_prims_algorithm()
-            case "Basic Weight Maze":
-                self.generator.basic_weight_maze()
-            case "Basic Random Maze":
-                self.generator.basic_random_maze()
+        self.generator.generate(algorithm)
 
         list(self.animator.nodes_to_animate.values()
              )[-1][-1].after_animation = after_generation
 
-    def _draw_walls_around(self) -> None:
-        """Draw walls around the maze
-        """
-
-        # Top Horizontal
-        nodes_to_animate = []
-        for i in range(self.width):
-            x, y = self.coords[0][i]
-            nodes_to_animate.append(
-                AnimatingNode(
-                    rect=pygame.Rect(0, 0, MIN_SIZE, MIN_SIZE),
-                    center=(x + CELL_SIZE // 2, y + CELL_SIZE // 2),
-                    value="#",
-                    ticks=pygame.time.get_ticks(),
-                    color=DARK
-                )
-            )
-
-        self.animator.add_nodes_to_animate(nodes_to_animate)
-
-        # Bottom horizontal
-        nodes_to_animate = []
-        for i in range(self.width):
-            x, y = self.coords[-1][i]
-            nodes_to_animate.append(
-                AnimatingNode(
-                    rect=pygame.Rect(0, 0, MIN_SIZE, MIN_SIZE),
-                    center=(x + CELL_SIZE // 2, y + CELL_SIZE // 2),
-                    value="#",
-                    ticks=pygame.time.get_ticks(),
-                    color=DARK
-                )
-            )
-
-        self.animator.add_nodes_to_animate(nodes_to_animate)
-
-        # Sides
-        nodes_to_animate = []
-        for i in range(self.height):
-            x, y = self.coords[i][0]
-            nodes_to_animate.append(
-                AnimatingNode(
-                    rect=pygame.Rect(0, 0, MIN_SIZE, MIN_SIZE),
-                    center=(x + CELL_SIZE // 2, y + CELL_SIZE // 2),
-                    value="#",
-                    ticks=pygame.time.get_ticks(),
-                    color=DARK
-                )
-            )
-
-            x, y = self.coords[i][-1]
-            nodes_to_animate.append(
-                AnimatingNode(
-                    rect=pygame.Rect(0, 0, MIN_SIZE, MIN_SIZE),
-                    center=(x + CELL_SIZE // 2, y + CELL_SIZE // 2),
-                    value="#",
-                    ticks=pygame.time.get_ticks(),
-                    color=DARK
-                )
-            )
-
-        self.animator.add_nodes_to_animate(nodes_to_animate)
-
-    def solve(self, algo_name: str, beam_width: int = 3) -> Solution:
+    def solve(
+        self,
+        algo_name: str,
+        beam_width: int = 3,
+        moving_start: bool = False,
+    ) -> Solution:
         """Solve the maze with an algorithm
 
         Args:
             algo_name (str): Name of algorithm
+            beam_width (int, optional): Beam width of local beam search. Defaults to 3.
+            moving_start (bool, optional): Only the start moved since the last call,
+                so optimal searches may reuse the goal's distance field. Defaults to False.
         """
-        # String -> Search Algorithm
-        mapper: dict[str, Search] = {
-            "Breadth First Search": Search.BREADTH_FIRST_SEARCH,
-            "Local Beam Search": Search.LOCAL_BEAM_SEARCH,
-            "Greedy Best First Search": Search.GREEDY_BEST_FIRST_SEARCH
-        }
-
-        # Instantiate Grid for PathFinder
-        grid = Grid(self.maze, self.start, self.goal)  # type: ignore
-
         # Solve the maze
         solution = PathFinder.find_path(
-            grid=grid,
-            search=mapper[algo_name.strip()],
+            grid=self.grid,
+            search=SEARCHES[algo_name.strip()],
             beam_width=beam_width,
+            moving_start=moving_start,
         )
 
         return solution
 
+    def stream_solve(self, algo_name: str, beam_width: int = 3) -> SearchStream:
+        """Start solving the maze without running the search yet
+
+        Args:
+            algo_name (str): Name of algorithm
+            beam_width (int, optional): Beam width of local beam search. Defaults to 3.
+
+        Returns:
+            SearchStream: Explored cells as the search runs, then the solution
+        """
+        return PathFinder.stream(
+            grid=self.grid,
+            search=SEARCHES[algo_name.strip()],
+            beam_width=beam_width,
+        )
+
     def visualize(
         self,
         solution: Solution,
@@ -391,8 +361,93 @@ class Maze:
         """
 
         # Animate solution nodes
+        gap = self._gap()
+        nodes = self._explored_nodes(solution.explored)
+        self.animator.add_nodes_to_animate(nodes, gap=gap)
+
+        if solution.path:
+            self._visualize_path(solution, gap, after_animation)
+        elif nodes:
+            nodes[-1].after_animation = after_animation
+        elif after_animation:
+            # Nothing was explored, so no node is left to call it
+            after_animation()
+
+    def visualize_stream(
+        self,
+        stream: SearchStream,
+        after_animation: Optional[AnimationCallback] = None,
+    ) -> None:
+        """Visualize a search while it runs
+
+        ``pump`` has to be called once per frame: it only runs the search
+        as far as the animation has come, so the first cells show up on
+        the next frame however large the maze is.
+
+        Args:
+            stream (SearchStream): Search from ``stream_solve``
+            after_animation (Optional[AnimationCallback], optional): Called after animation. Defaults to None.
+        """
+        if self.stream:
+            self.stream.close()
+
+        self.stream = stream
+        self.stream_until = pygame.time.get_ticks()
+        self.stream_last = None
+        self.stream_callback = after_animation
+
+    def pump(self) -> None:
+        """Animate the cells explored since the last frame"""
+        if not self.stream:
+            return
+
+        # Only run the search STREAM_LOOKAHEAD ms ahead of the animation
+        gap = self._gap()
+        now = pygame.time.get_ticks()
+        self.stream_until = max(self.stream_until, now)
+        if self.stream_until > now + STREAM_LOOKAHEAD:
+            return
+
+        cells = self.stream.take((now + STREAM_LOOKAHEAD - self.stream_until) // gap + 1)
+        if cells:
+            # Waiting nodes have their ticks moved to the current frame by
+            # the animator, so batches are placed at absolute times instead
+            # of after the last added node
+            nodes = self._explored_nodes(cells)
+            for node in nodes:
+                node.time_updated = True
+            self.animator.add_nodes_to_animate(nodes, gap=gap, start=self.stream_until)
+            self.stream_until += gap * len(nodes)
+            self.stream_last = nodes[-1]
+
+        if not self.stream.done:
+            return
+
+        solution, last, after_animation = \
+            self.stream.solution, self.stream_last, self.stream_callback
+        self.stream = None
+        if solution and solution.path:
+            self._visualize_path(solution, gap, after_animation,
+                                 start=self.stream_until - gap + 600)
+        elif last and last.progress < last.duration:
+            last.after_animation = after_animation
+        elif after_animation:
+            after_animation()
+
+    def _gap(self) -> int:
+        match self.speed:
+            case "Fast":
+                return 5
+            case "Medium":
+                return 30
+            case "Slow":
+                return 1000
+            case _:
+                return 5
+
+    def _explored_nodes(self, cells: Iterable[tuple[int, int]]) -> list[AnimatingNode]:
         nodes = []
-        for cell in solution.explored:
+        for cell in cells:
             x, y = self.coords[cell[0]][cell[1]]
             nodes.append(
                 AnimatingNode(
@@ -407,22 +462,15 @@ class Maze:
                 )
             )
 
-        match self.speed:
-            case "Fast":
-                gap = 5
-            case "Medium":
-                gap = 30
-            case "Slow":
-                gap = 1000
-            case _:
-                gap = 5
-
-        self.animator.add_nodes_to_animate(nodes, gap=gap)
-
-        if not solution.path:
-            nodes[-1].after_animation = after_animation
-            return
+        return nodes
 
+    def _visualize_path(
+        self,
+        solution: Solution,
+        gap: int,
+        after_animation: Optional[AnimationCallback] = None,
+        start: int | None = None,
+    ) -> None:
         # Color the shortest path in yellowd
         nodes = []
         for cell in solution.path:
@@ -446,7 +494,12 @@ class Maze:
             case 1000:
                 gap = 50
 
-        self.animator.add_nodes_to_animate(nodes, delay=600, gap=gap)
+        if start is None:
+            self.animator.add_nodes_to_animate(nodes, delay=600, gap=gap)
+        else:
+            for node in nodes:
+                node.time_updated = True
+            self.animator.add_nodes_to_animate(nodes, gap=gap, start=start)
         nodes[-1].after_animation = after_animation
 
     def _draw_rect(
@@ -1,17 +1,55 @@
 import time
 from typing import Callable
 
-from .bfs import BreadthFirstSearch
+from .astar import AStarSearch
+from .cache import SolutionCache
+from .bfs import BidirectionalBreadthFirstSearch, BreadthFirstSearch
+from .dijkstra import DijkstraSearch
+from .dstarlite import DStarLiteSearch
+from .field import DistanceField
+from .greedy import GreedyBestFirstSearch
+from .hpa import HierarchicalAStarSearch
+from .jps import JumpPointSearch
 from .localbeam import LocalBeamSearch
-from .models import Grid, Solution, Search
+from .models import Grid, NoSolution, Solution, Search
+from .stream import CellStream, SearchStream, replay
+from .wavefront import WavefrontSearch
 
 SearchFunction = Callable[[Grid, int], Solution]
+StreamFunction = Callable[[Grid, int], CellStream]
 
 SEARCH: dict[Search, SearchFunction] = {
     Search.BREADTH_FIRST_SEARCH: BreadthFirstSearch.search,
     Search.LOCAL_BEAM_SEARCH: LocalBeamSearch.search,
+    Search.GREEDY_BEST_FIRST_SEARCH: GreedyBestFirstSearch.search,
+    Search.DIJKSTRA: DijkstraSearch.search,
+    Search.A_STAR: AStarSearch.search,
+    Search.BIDIRECTIONAL_BFS: BidirectionalBreadthFirstSearch.search,
+    Search.JUMP_POINT_SEARCH: JumpPointSearch.search,
+    Search.HIERARCHICAL_A_STAR: HierarchicalAStarSearch.search,
+    Search.D_STAR_LITE: DStarLiteSearch.search,
+    Search.WAVEFRONT_BFS: WavefrontSearch.search,
 }
 
+# Searches that yield their cells while running; the others run in one go
+# and are replayed, see PathFinder.stream
+STREAMS: dict[Search, StreamFunction] = {
+    Search.BREADTH_FIRST_SEARCH: BreadthFirstSearch.stream,
+    Search.LOCAL_BEAM_SEARCH: LocalBeamSearch.stream,
+    Search.GREEDY_BEST_FIRST_SEARCH: GreedyBestFirstSearch.stream,
+    Search.DIJKSTRA: DijkstraSearch.stream,
+    Search.A_STAR: AStarSearch.stream,
+    Search.BIDIRECTIONAL_BFS: BidirectionalBreadthFirstSearch.stream,
+    Search.JUMP_POINT_SEARCH: JumpPointSearch.stream,
+    Search.HIERARCHICAL_A_STAR: HierarchicalAStarSearch.stream,
+}
+
+# Searches whose paths are optimal, so they can be read off a distance field
+FIELD_SEARCHES = {Search.DIJKSTRA, Search.A_STAR}
+
+# Results of recent find_path calls, see SolutionCache
+CACHE = SolutionCache()
+
 
 class PathFinder:
     @staticmethod
@@ -19,10 +57,143 @@ class PathFinder:
         grid: Grid,
         search: Search,
         beam_width: int = 3,
+        moving_start: bool = False,
+        use_cache: bool = True,
     ) -> Solution:
         start_time = time.perf_counter()
+        if moving_start and search in FIELD_SEARCHES:
+            solution = PathFinder.follow_field(grid)
+            solution.time = (time.perf_counter() - start_time) * 1000
+            return solution
+
+        # Kết quả lấy từ cache giữ nguyên thời gian của lần tìm kiếm gốc
+        if use_cache:
+            key = CACHE.key(grid, search, beam_width)
+            if (cached := CACHE.get(key)) is not None:
+                return cached
+
         solution = SEARCH[search](grid, beam_width)
         time_taken = (time.perf_counter() - start_time) * 1000
         solution.time = time_taken
 
+        if use_cache:
+            CACHE.put(key, solution)
         return solution
+
+    @staticmethod
+    def stream(
+        grid: Grid,
+        search: Search,
+        beam_width: int = 3,
+        moving_start: bool = False,
+        use_cache: bool = True,
+    ) -> SearchStream:
+        """Search step by step, yielding explored cells as they happen
+
+        Nothing runs until the stream is iterated, and closing it stops
+        the search. The solution is cached like with ``find_path`` once the
+        stream finishes, unless the grid was edited meanwhile.
+
+        Args:
+            grid (Grid): Grid to solve, must not change while streaming
+            search (Search): Search algorithm
+            beam_width (int, optional): Beam width of local beam search. Defaults to 3.
+            moving_start (bool, optional): See ``find_path``. Defaults to False.
+            use_cache (bool, optional): Read and fill the solution cache. Defaults to True.
+
+        Returns:
+            SearchStream: Explored positions, then ``solution``
+        """
+        if moving_start and search in FIELD_SEARCHES:
+            return SearchStream(grid, replay(grid, lambda: PathFinder.follow_field(grid)))
+
+        if not use_cache:
+            return SearchStream(grid, PathFinder._cells(grid, search, beam_width))
+
+        key = CACHE.key(grid, search, beam_width)
+        if (cached := CACHE.get(key)) is not None:
+            return SearchStream(grid, replay(grid, lambda: cached), timed=False)
+
+        def store(solution: Solution) -> None:
+            if CACHE.key(grid, search, beam_width) == key:
+                CACHE.put(key, solution)
+
+        return SearchStream(grid, PathFinder._cells(grid, search, beam_width), store)
+
+    @staticmethod
+    def _cells(grid: Grid, search: Search, beam_width: int) -> CellStream:
+        if search in STREAMS:
+            return STREAMS[search](grid, beam_width)
+        return replay(grid, lambda: SEARCH[search](grid, beam_width))
+
+    @staticmethod
+    def follow_field(grid: Grid) -> Solution:
+        """Read the path off the goal's cached distance field
+
+        Only the first call after the goal moved or the grid was edited
+        runs a search; while only the start moves every call costs
+        O(path length).
+
+        Args:
+            grid (Grid): Grid to solve
+
+        Returns:
+            Solution: Shortest path, exploring only the cells on it
+        """
+        field = DistanceField.of(grid)
+        path = field.path(grid.index(grid.start))
+        if not path:
+            return NoSolution.from_indices(grid, [], [])
+
+        return Solution.from_indices(grid, path, path)
+
+    @staticmethod
+    def find_paths(
+        grid: Grid,
+        queries: list[tuple[tuple[int, int], tuple[int, int]]],
+    ) -> list[Solution]:
+        """Answer many (start, goal) queries on one grid
+
+        Queries are grouped by goal and every goal gets one reverse search,
+        whose distance field then answers each of its starts in O(path
+        length). The fields share one buffer and the grid's own endpoints
+        are left untouched. Paths are optimal, as with Dijkstra.
+
+        Args:
+            grid (Grid): Grid to solve
+            queries (list[tuple[tuple[int, int], tuple[int, int]]]): (start, goal) pairs
+
+        Returns:
+            list[Solution]: One solution per query, in query order
+        """
+        start_time = time.perf_counter()
+        by_goal: dict[int, list[int]] = {}
+        for number, (_, goal) in enumerate(queries):
+            by_goal.setdefault(grid.index(goal), []).append(number)
+
+        solutions: list[Solution] = [NoSolution([], []) for _ in queries]
+        # Trường đã lưu trên lưới vẫn dùng được nếu lưới chưa bị sửa
+        cached: DistanceField | None = grid.cache.get("field")
+        if cached is not None and cached.version != grid.version:
+            cached = None
+
+        buffer: DistanceField | None = None
+        for goal, numbers in by_goal.items():
+            if cached is not None and cached.goal == goal:
+                field = cached
+            elif buffer is None:
+                field = buffer = DistanceField(grid, goal)
+            else:
+                field = buffer
+                field.retarget(goal)
+
+            for number in numbers:
+                path = field.path(grid.index(queries[number][0]))
+                if path:
+                    solutions[number] = Solution.from_indices(grid, path, path)
+
+        time_taken = (time.perf_counter() - start_time) * 1000
+        for solution in solutions:
+            solution.time = time_taken / len(queries)
+
+        return solutions
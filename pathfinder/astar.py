@@ -0,0 +1,94 @@
+from array import array
+from enum import Enum
+
+from . import tracing
+from .heuristics import HEURISTICS, Heuristic
+from .models import UNREACHED, Grid, IndexedPriorityQueue, NoSolution, Solution
+from .stream import CellStream, drain
+
+
+class TieBreak(Enum):
+    LARGER_G = "G"
+    GOAL_WARD = "H"
+    FIFO = "FIFO"
+
+
+class AStarSearch:
+    @staticmethod
+    def search(
+        grid: Grid,
+        beam_width: int = 3,
+        heuristic: Heuristic = Heuristic.MANHATTAN,
+        tie_break: TieBreak = TieBreak.LARGER_G,
+    ) -> Solution:
+        return drain(AStarSearch.stream(grid, beam_width, heuristic, tie_break))
+
+    @staticmethod
+    def stream(
+        grid: Grid,
+        beam_width: int = 3,
+        heuristic: Heuristic = Heuristic.MANHATTAN,
+        tie_break: TieBreak = TieBreak.LARGER_G,
+    ) -> CellStream:
+        moves, steps, costs, width = grid.moves, grid.steps, grid.costs, grid.width
+        estimate = HEURISTICS[heuristic]
+        start = grid.index(grid.start)
+        goal = grid.index(grid.end)
+        goal_row, goal_col = grid.end
+
+        # Chi phí thực tế g từ ô bắt đầu, lưu riêng cho lần tìm kiếm này
+        distances = array("i", [UNREACHED]) * grid.size
+        parents = array("i", [-1]) * grid.size
+        closed = bytearray(grid.size)
+        distances[start] = 0
+
+        # Độ ưu tiên là (f, khoá phụ): khi f bằng nhau, khoá phụ quyết định
+        # ô nào được mở rộng trước
+        order = 0
+        h = estimate(abs(grid.start[0] - goal_row), abs(grid.start[1] - goal_col))
+        frontier = IndexedPriorityQueue()
+        frontier.push(start, (h, 0))
+        explored = []
+        trace = tracing.active()
+
+        while frontier:
+            cell = frontier.pop()
+            closed[cell] = 1
+            explored.append(cell)
+            if trace:
+                trace.expand(grid.position(cell))
+            yield cell
+            if cell == goal:
+                if trace:
+                    trace.goal(grid.position(cell))
+                return Solution.from_indices(
+                    grid, grid.walk_back(parents, cell), explored)
+
+            distance = distances[cell]
+            for _, offset in steps[moves[cell]]:
+                neighbour = cell + offset
+                if closed[neighbour]:
+                    continue
+
+                g = distance + costs[neighbour]
+                if g >= distances[neighbour]:
+                    continue
+
+                distances[neighbour] = g
+                parents[neighbour] = cell
+                row, col = divmod(neighbour, width)
+                h = estimate(abs(row - goal_row), abs(col - goal_col))
+
+                if tie_break is TieBreak.LARGER_G:
+                    priority = (g + h, -g)
+                elif tie_break is TieBreak.GOAL_WARD:
+                    priority = (g + h, h)
+                else:
+                    order += 1
+                    priority = (g + h, order)
+
+                frontier.push(neighbour, priority)
+                if trace:
+                    trace.generate((row, col))
+
+        return NoSolution.from_indices(grid, [], explored)
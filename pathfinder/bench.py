@@ -0,0 +1,295 @@
+"""Headless benchmarks for the search engines
+
+Run with ``python -m pathfinder.bench``, see ``--help`` for the options.
+Nothing here imports pygame, so it runs without a display.
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from array import array
+
+from .PathFinder import SEARCH, PathFinder
+from .compare import best_width, sweep_beam_widths
+from .dijkstra import DijkstraSearch
+from .generate import GENERATORS, generate
+from .models import BucketQueue, CompactGrid, IndexedPriorityQueue, Search
+
+FRONTIERS = {
+    "heap": IndexedPriorityQueue,
+    "bucket": BucketQueue,
+}
+
+
+def weighted_grid(
+    width: int,
+    height: int,
+    wall_ratio: float = 0.2,
+    seed: int | None = None
+) -> CompactGrid:
+    """Build a random weighted grid with the corners as start and goal
+
+    Args:
+        width (int): Number of columns
+        height (int): Number of rows
+        wall_ratio (float, optional): Share of wall cells. Defaults to 0.2.
+        seed (int | None, optional): Random seed. Defaults to None.
+
+    Returns:
+        CompactGrid: Generated grid
+    """
+    rng = random.Random(seed)
+    size = width * height
+
+    walls = bytearray(rng.random() < wall_ratio for _ in range(size))
+    costs = array("i", (-1 if wall else rng.randint(1, 8) for wall in walls))
+
+    start, end = (0, 0), (height - 1, width - 1)
+    walls[0] = walls[size - 1] = 0
+    costs[0], costs[size - 1] = 0, 1
+
+    return CompactGrid(width, height, costs, walls, start, end)
+
+
+def maze_grid(algorithm: str, size: int, seed: int | None = None) -> CompactGrid:
+    """Generate a square maze with pathfinder.generate
+
+    Start and goal sit on odd cells near opposite corners, the cells that
+    the carving generators open.
+
+    Args:
+        algorithm (str): Generator name, a key of GENERATORS
+        size (int): Side length
+        seed (int | None, optional): Random seed. Defaults to None.
+
+    Returns:
+        CompactGrid: Generated maze
+    """
+    corner = size - 2 if (size - 2) % 2 else size - 3
+    goal = (max(corner, 0), max(corner, 0))
+
+    return generate(algorithm, size, size, (min(1, size - 1),) * 2, goal, seed).grid()
+
+
+def compare_frontiers(
+    sizes: list[int],
+    repeats: int = 5,
+    seed: int = 0
+) -> list[dict[str, float | int | str]]:
+    """Time Dijkstra with every frontier type on the same weighted grids
+
+    Args:
+        sizes (list[int]): Side lengths of the square grids
+        repeats (int, optional): Runs per grid and frontier. Defaults to 5.
+        seed (int, optional): Random seed for the grids. Defaults to 0.
+
+    Returns:
+        list[dict[str, float | int | str]]: One row per grid and frontier
+    """
+    rows = []
+    for size in sizes:
+        grid = weighted_grid(size, size, seed=seed)
+
+        for name, frontier_type in FRONTIERS.items():
+            times = []
+            for _ in range(repeats):
+                start_time = time.perf_counter()
+                solution = DijkstraSearch.search(
+                    grid, frontier_type=frontier_type)
+                times.append((time.perf_counter() - start_time) * 1000)
+
+            rows.append({
+                "grid": f"{size}x{size}",
+                "frontier": name,
+                "median_ms": statistics.median(times),
+                "best_ms": min(times),
+                "explored": solution.explored_length,
+                "path_cost": solution.path_cost,
+            })
+
+    return rows
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """Linearly interpolated percentile of a non-empty sample
+
+    Args:
+        samples (list[float]): Measured values
+        q (float): Percentile between 0 and 100
+
+    Returns:
+        float: The q-th percentile
+    """
+    ordered = sorted(samples)
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def benchmark_searches(
+    sizes: list[int],
+    searches: list[Search] | None = None,
+    repeats: int = 5,
+    wall_ratio: float = 0.2,
+    beam_width: int = 3,
+    seed: int = 0,
+    generator: str | None = None
+) -> list[dict[str, float | int | str]]:
+    """Run every registered search on the same generated grids
+
+    Searches that cache data on the grid (HPA*, D* Lite) get a fresh copy
+    of the grid on every run, so each sample includes their set-up.
+
+    Args:
+        sizes (list[int]): Side lengths of the square grids
+        searches (list[Search] | None, optional): Searches to run. Defaults to all of SEARCH.
+        repeats (int, optional): Runs per grid and search. Defaults to 5.
+        wall_ratio (float, optional): Share of wall cells. Defaults to 0.2.
+        beam_width (int, optional): Beam width of local beam search. Defaults to 3.
+        seed (int, optional): Random seed for the grids. Defaults to 0.
+        generator (str | None, optional): Maze generator to use instead of
+            random weighted grids. Defaults to None.
+
+    Returns:
+        list[dict[str, float | int | str]]: One row per grid and search
+    """
+    rows = []
+    for size in sizes:
+        if generator:
+            grid = maze_grid(generator, size, seed)
+        else:
+            grid = weighted_grid(size, size, wall_ratio, seed=seed)
+
+        for search in searches or list(SEARCH):
+            times = []
+            for _ in range(repeats):
+                solution = PathFinder.find_path(
+                    CompactGrid.from_grid(grid), search, beam_width, use_cache=False)
+                times.append(solution.time)
+
+            rows.append({
+                "grid": f"{size}x{size}",
+                "search": search.value,
+                "explored": solution.explored_length,
+                "path_length": solution.path_length,
+                "path_cost": solution.path_cost,
+                "p50_ms": percentile(times, 50),
+                "p90_ms": percentile(times, 90),
+                "p99_ms": percentile(times, 99),
+            })
+
+    return rows
+
+
+def sweep_table(
+    sizes: list[int],
+    widths: list[int],
+    wall_ratio: float = 0.2,
+    seed: int = 0,
+    generator: str | None = None
+) -> list[dict[str, float | int | str]]:
+    """Run local beam search with every width on the same generated grids
+
+    Args:
+        sizes (list[int]): Side lengths of the square grids
+        widths (list[int]): Beam widths to try
+        wall_ratio (float, optional): Share of wall cells. Defaults to 0.2.
+        seed (int, optional): Random seed for the grids. Defaults to 0.
+        generator (str | None, optional): Maze generator to use instead of
+            random weighted grids. Defaults to None.
+
+    Returns:
+        list[dict[str, float | int | str]]: One row per grid and width
+    """
+    rows = []
+    for size in sizes:
+        if generator:
+            grid = maze_grid(generator, size, seed)
+        else:
+            grid = weighted_grid(size, size, wall_ratio, seed=seed)
+
+        results = sweep_beam_widths(grid, widths)
+        best = best_width(results)
+        for label, metrics in results:
+            rows.append({
+                "grid": f"{size}x{size}",
+                "beam_width": int(label),
+                "explored": metrics["explored_length"],
+                "path_length": metrics["path_length"],
+                "path_cost": metrics["path_cost"],
+                "time_ms": metrics["time"],
+                "best": "*" if label == best else "",
+            })
+
+    return rows
+
+
+def print_table(rows: list[dict[str, float | int | str]]) -> None:
+    columns = list(rows[0])
+    cells = [[f"{row[column]:.2f}" if isinstance(row[column], float)
+              else str(row[column]) for column in columns] for row in rows]
+    widths = [max(len(column), *(len(line[i]) for line in cells))
+              for i, column in enumerate(columns)]
+
+    print(" ".join(column.rjust(width) for column, width in zip(columns, widths)))
+    for line in cells:
+        print(" ".join(cell.rjust(width) for cell, width in zip(line, widths)))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m pathfinder.bench",
+        description="Benchmark the search engines on random weighted grids.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 200],
+                        help="side lengths of the square grids")
+    parser.add_argument("--searches", nargs="+", metavar="NAME",
+                        choices=[search.value for search in SEARCH],
+                        help="searches to run (default: all)")
+    parser.add_argument("--repeats", type=int, default=5,
+                        help="runs per grid and search")
+    parser.add_argument("--wall-ratio", type=float, default=0.2,
+                        help="share of wall cells")
+    parser.add_argument("--maze", choices=list(GENERATORS), metavar="GENERATOR",
+                        help="use a generated maze instead of a random weighted"
+                             f" grid, one of: {', '.join(GENERATORS)}")
+    parser.add_argument("--beam-width", type=int, default=3,
+                        help="beam width of local beam search")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="random seed for the grids")
+    parser.add_argument("--beam-sweep", type=int, nargs="+", metavar="WIDTH",
+                        help="run local beam search with these widths instead"
+                             " of the searches and mark the best width")
+    parser.add_argument("--frontiers", action="store_true",
+                        help="compare Dijkstra frontiers instead of searches")
+    parser.add_argument("--json", metavar="PATH",
+                        help="also write the rows as JSON ('-' for stdout only)")
+    args = parser.parse_args(argv)
+
+    if args.frontiers:
+        rows = compare_frontiers(args.sizes, args.repeats, args.seed)
+    elif args.beam_sweep:
+        rows = sweep_table(args.sizes, args.beam_sweep, args.wall_ratio,
+                           args.seed, args.maze)
+    else:
+        searches = [Search(name) for name in args.searches] if args.searches else None
+        rows = benchmark_searches(args.sizes, searches, args.repeats,
+                                  args.wall_ratio, args.beam_width, args.seed,
+                                  args.maze)
+
+    if args.json == "-":
+        json.dump(rows, sys.stdout, indent=2)
+        print()
+        return
+
+    print_table(rows)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(rows, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
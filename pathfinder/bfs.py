@@ -1,48 +1,132 @@
-from .models import Grid, QueueFrontier, NoSolution, Solution
+from array import array
+from collections import deque
+
+from . import tracing
+from .models import Grid, NoSolution, Solution
+from .stream import CellStream, drain
 
 
 class BreadthFirstSearch:
     @staticmethod
-    def search(grid: Grid, _: int = 3) -> Solution:
-        # Khởi tạo nút bắt đầu và thêm vào Frontier
-        node = grid.get_node(pos=grid.start)
-        frontier = QueueFrontier()
-        frontier.add(node)
-        # Tạo dict để lưu trữ các trạng thái đã được khám phá
-        explored_states = {}
-
-        while True:
-            # Trả về NoSolution nếu Frontier rỗng
-            if frontier.is_empty():
-                return NoSolution([], list(explored_states))
-
-            # Lấy nút đầu tiên từ Frontier
-            node = frontier.remove()
-            # Thêm trạng thái hiện tại vào explored_states
-            explored_states[node.state] = True
-            # Nếu nút hiện tại là nút đích, tạo đường đi và trả về một đối tượng Solution
-            if node.state == grid.end:
-                # Tạo danh sách các ô đã đi qua
-                cells = []
-                path_cost = 0
-                temp = node
-                while temp.parent != None:
-                    cells.append(temp.state)
-                    path_cost += temp.cost
-                    temp = temp.parent
-
-                cells.append(grid.start)
-                cells.reverse()
-
-                return Solution(
-                    cells, list(explored_states), path_cost=path_cost)
-
-            # Xác định các nút láng giềng của nút hiện tại
-            for action, state in grid.get_neighbours(node.state).items():
-                if state in explored_states or frontier.contains_state(state):
+    def search(grid: Grid, beam_width: int = 3) -> Solution:
+        return drain(BreadthFirstSearch.stream(grid, beam_width))
+
+    @staticmethod
+    def stream(grid: Grid, beam_width: int = 3) -> CellStream:
+        moves, steps = grid.moves, grid.steps
+        start = grid.index(grid.start)
+        goal = grid.index(grid.end)
+
+        # Mảng cha và bitmap đánh dấu riêng cho lần tìm kiếm này,
+        # không ghi lên các nút của Grid
+        parents = array("i", [-1]) * grid.size
+        seen = bytearray(grid.size)
+        seen[start] = 1
+
+        # Khởi tạo Frontier với ô bắt đầu
+        frontier = deque([start])
+        # Danh sách các ô đã được khám phá theo thứ tự
+        explored = []
+        trace = tracing.active()
+
+        while frontier:
+            # Lấy ô đầu tiên từ Frontier
+            cell = frontier.popleft()
+            explored.append(cell)
+            if trace:
+                trace.expand(grid.position(cell))
+            yield cell
+            # Nếu ô hiện tại là ô đích, tạo đường đi và trả về một đối tượng Solution
+            if cell == goal:
+                if trace:
+                    trace.goal(grid.position(cell))
+                return Solution.from_indices(
+                    grid, grid.walk_back(parents, cell), explored)
+
+            # Xác định các ô láng giềng của ô hiện tại
+            for _, offset in steps[moves[cell]]:
+                neighbour = cell + offset
+                if seen[neighbour]:
                     continue
 
-                new = grid.get_node(pos=state)
-                new.parent = node
-                new.action = action
-                frontier.add(node=new)
+                seen[neighbour] = 1
+                parents[neighbour] = cell
+                frontier.append(neighbour)
+                if trace:
+                    trace.generate(grid.position(neighbour))
+
+        # Trả về NoSolution nếu Frontier rỗng
+        return NoSolution.from_indices(grid, [], explored)
+
+
+class BidirectionalBreadthFirstSearch:
+    @staticmethod
+    def search(grid: Grid, beam_width: int = 3) -> Solution:
+        return drain(BidirectionalBreadthFirstSearch.stream(grid, beam_width))
+
+    @staticmethod
+    def stream(grid: Grid, beam_width: int = 3) -> CellStream:
+        moves, steps = grid.moves, grid.steps
+        start = grid.index(grid.start)
+        goal = grid.index(grid.end)
+        trace = tracing.active()
+
+        if start == goal:
+            yield start
+            return Solution.from_indices(grid, [start], [start])
+
+        # parents trỏ về phía ô bắt đầu, successors trỏ về phía ô đích.
+        # sides đánh dấu ô đã được phía nào chạm tới (1: xuôi, 2: ngược)
+        parents = array("i", [-1]) * grid.size
+        successors = array("i", [-1]) * grid.size
+        sides = bytearray(grid.size)
+        sides[start] = 1
+        sides[goal] = 2
+
+        forward, backward = [start], [goal]
+        explored = []
+
+        while forward and backward:
+            # Luôn mở rộng trọn một lớp của phía có Frontier nhỏ hơn
+            if len(forward) <= len(backward):
+                layer, links, side = forward, parents, 1
+            else:
+                layer, links, side = backward, successors, 2
+
+            next_layer = []
+            for cell in layer:
+                explored.append(cell)
+                if trace:
+                    trace.expand(grid.position(cell))
+                yield cell
+
+                for _, offset in steps[moves[cell]]:
+                    neighbour = cell + offset
+                    reached = sides[neighbour]
+                    if reached & side:
+                        continue
+
+                    if reached:
+                        # Hai phía gặp nhau: lần gặp đầu tiên cho đường đi
+                        # ngắn nhất, nối hai nửa tại ô gặp nhau
+                        links[neighbour] = cell
+                        head = grid.walk_back(parents, neighbour)
+                        tail = grid.walk_back(successors, neighbour)
+                        tail.reverse()
+                        if trace:
+                            trace.goal(grid.position(neighbour))
+                        return Solution.from_indices(
+                            grid, head + tail[1:], explored)
+
+                    sides[neighbour] = side
+                    links[neighbour] = cell
+                    next_layer.append(neighbour)
+                    if trace:
+                        trace.generate(grid.position(neighbour))
+
+            if side == 1:
+                forward = next_layer
+            else:
+                backward = next_layer
+
+        return NoSolution.from_indices(grid, [], explored)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import copy
+from collections import OrderedDict
+from typing import Hashable
+
+from .models import Grid, Search, Solution
+
+
+class SolutionCache:
+    """Size-bounded LRU cache of search results
+
+    Entries are keyed by the grid fingerprint and the query, so any grid
+    with the same contents hits and an edited grid misses. Solutions are
+    copied on the way in and out, so callers may modify what they get back.
+    """
+
+    def __init__(self, capacity: int = 32) -> None:
+        self.capacity = capacity
+        self.entries: OrderedDict[Hashable, Solution] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(grid: Grid, search: Search, beam_width: int) -> Hashable:
+        """Build the cache key of a query
+
+        Args:
+            grid (Grid): Grid being searched
+            search (Search): Search algorithm
+            beam_width (int): Beam width of local beam search, ignored by the other searches
+
+        Returns:
+            Hashable: Key for ``get`` and ``put``
+        """
+        # Chỉ local beam search dùng beam_width, các thuật toán khác dùng chung một mục
+        width = beam_width if search is Search.LOCAL_BEAM_SEARCH else 0
+        return (grid.fingerprint, grid.width, grid.height,
+                grid.start, grid.end, search, width)
+
+    def get(self, key: Hashable) -> Solution | None:
+        solution = self.entries.get(key)
+        if solution is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return copy.copy(solution)
+
+    def put(self, key: Hashable, solution: Solution) -> None:
+        self.entries[key] = copy.copy(solution)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __repr__(self) -> str:
+        return (f"SolutionCache({len(self.entries)}/{self.capacity},"
+                f" hits={self.hits}, misses={self.misses})")
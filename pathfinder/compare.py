@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable
+
+from .PathFinder import PathFinder
+from .models import CompactGrid, Grid, Search
+
+# (label, search, grid, beam width)
+Job = tuple[str, Search, CompactGrid, int]
+Metrics = dict[str, float]
+
+
+def make_jobs(
+    searches: dict[str, Search],
+    grids: Iterable[Grid],
+    beam_width: int = 3,
+) -> list[Job]:
+    """Pair every search with every grid
+
+    Args:
+        searches (dict[str, Search]): Searches by display label
+        grids (Iterable[Grid]): Grids to solve, copied into compact grids
+        beam_width (int, optional): Beam width of local beam search. Defaults to 3.
+
+    Returns:
+        list[Job]: One job per (search, grid)
+    """
+    compact = [CompactGrid.from_grid(grid) for grid in grids]
+    return [(label, search, grid, beam_width)
+            for grid in compact for label, search in searches.items()]
+
+
+def run_job(job: Job) -> tuple[str, Metrics]:
+    label, search, grid, beam_width = job
+    solution = PathFinder.find_path(grid, search, beam_width, use_cache=False)
+
+    # Chỉ gửi các số liệu về tiến trình chính, không gửi đường đi
+    return label, solution.summary()
+
+
+def run_chunk(jobs: list[Job]) -> list[tuple[str, Metrics]]:
+    return [run_job(job) for job in jobs]
+
+
+def aggregate(results: Iterable[tuple[str, Metrics]]) -> list[tuple[str, Metrics]]:
+    """Average the metrics of every label, fastest first
+
+    Args:
+        results (Iterable[tuple[str, Metrics]]): Metrics of single jobs
+
+    Returns:
+        list[tuple[str, Metrics]]: Rows in the format of the results table
+    """
+    totals: dict[str, Metrics] = {}
+    counts: dict[str, int] = {}
+    for label, metrics in results:
+        if label not in totals:
+            totals[label] = dict(metrics)
+            counts[label] = 1
+            continue
+
+        for name, value in metrics.items():
+            totals[label][name] += value
+        counts[label] += 1
+
+    rows = []
+    for label, metrics in totals.items():
+        count = counts[label]
+        rows.append((label, {
+            "explored_length": metrics["explored_length"] // count,
+            "path_length": metrics["path_length"] // count,
+            "path_cost": metrics["path_cost"] // count,
+            "time": metrics["time"] / count,
+        }))
+
+    rows.sort(key=lambda row: row[1]["time"])
+    return rows
+
+
+class JobBatch:
+    """Jobs running on a process pool without blocking the caller
+
+    ``poll`` only looks at the futures, so a frame loop can call it once
+    per frame; ``wait`` blocks until every job is done. The pool uses the
+    default start method of the platform.
+    """
+
+    def __init__(
+        self,
+        jobs: list[Job],
+        max_workers: int | None = None,
+        on_finish: Callable[[list[tuple[str, Metrics]]], None] | None = None,
+    ) -> None:
+        workers = max_workers or os.cpu_count() or 1
+        chunksize = max(1, len(jobs) // (4 * workers))
+        self.on_finish = on_finish
+        self.results: list[tuple[str, Metrics]] | None = None
+
+        # Gửi job theo từng phần để giảm số lần trao đổi giữa các tiến trình
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.futures = [self.pool.submit(run_chunk, jobs[index:index + chunksize])
+                        for index in range(0, len(jobs), chunksize)]
+
+    @property
+    def done(self) -> bool:
+        return self.results is not None
+
+    def poll(self) -> bool:
+        """Collect the results if every job is done, without waiting
+
+        Returns:
+            bool: Whether the results are ready
+        """
+        if not self.done and all(future.done() for future in self.futures):
+            self._finish()
+
+        return self.done
+
+    def wait(self) -> list[tuple[str, Metrics]]:
+        """Wait for every job
+
+        Returns:
+            list[tuple[str, Metrics]]: Metrics of every job, in job order
+        """
+        if not self.done:
+            self._finish()
+
+        return self.results  # type: ignore[return-value]
+
+    def cancel(self) -> None:
+        """Drop the jobs that have not started and release the pool"""
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def _finish(self) -> None:
+        results = [row for future in self.futures for row in future.result()]
+        self.pool.shutdown()
+        self.results = results
+        if self.on_finish:
+            self.on_finish(results)
+
+
+def run_jobs(jobs: list[Job], max_workers: int | None = None) -> list[tuple[str, Metrics]]:
+    """Run jobs on a process pool and wait for them
+
+    Args:
+        jobs (list[Job]): Jobs to run
+        max_workers (int | None, optional): Pool size. Defaults to one per core.
+
+    Returns:
+        list[tuple[str, Metrics]]: Metrics of every job, in job order
+    """
+    return JobBatch(jobs, max_workers).wait()
+
+
+def compare(jobs: list[Job], max_workers: int | None = None) -> list[tuple[str, Metrics]]:
+    """Run jobs on a process pool and aggregate their metrics
+
+    Args:
+        jobs (list[Job]): Jobs from ``make_jobs``
+        max_workers (int | None, optional): Pool size. Defaults to one per core.
+
+    Returns:
+        list[tuple[str, Metrics]]: Averaged rows, fastest first
+    """
+    return aggregate(run_jobs(jobs, max_workers))
+
+
+def beam_width_jobs(grid: Grid, widths: Iterable[int]) -> list[Job]:
+    """One local beam search job per beam width on the same grid
+
+    Args:
+        grid (Grid): Grid to solve, copied into a compact grid
+        widths (Iterable[int]): Beam widths to try
+
+    Returns:
+        list[Job]: Jobs labelled by the width, in width order
+    """
+    compact = CompactGrid.from_grid(grid)
+    return [(str(width), Search.LOCAL_BEAM_SEARCH, compact, width)
+            for width in sorted(set(widths))]
+
+
+def sweep_beam_widths(
+    grid: Grid,
+    widths: Iterable[int],
+    max_workers: int | None = None,
+) -> list[tuple[str, Metrics]]:
+    """Run local beam search once per beam width on the same grid
+
+    Args:
+        grid (Grid): Grid to solve, copied into a compact grid
+        widths (Iterable[int]): Beam widths to try
+        max_workers (int | None, optional): Pool size. Defaults to one per core.
+
+    Returns:
+        list[tuple[str, Metrics]]: One row per width labelled by the width, in width order
+    """
+    return run_jobs(beam_width_jobs(grid, widths), max_workers)
+
+
+def best_width(rows: list[tuple[str, Metrics]]) -> str | None:
+    """Pick the narrowest beam that reaches the goal at the lowest cost found
+
+    Args:
+        rows (list[tuple[str, Metrics]]): Rows from ``sweep_beam_widths``
+
+    Returns:
+        str | None: Label of the chosen width, None when no width reaches the goal
+    """
+    reached = [(metrics["path_cost"], int(label))
+               for label, metrics in rows if metrics["path_length"]]
+    if not reached:
+        return None
+
+    return str(min(reached)[1])
@@ -0,0 +1,67 @@
+from array import array
+
+from . import tracing
+from .models import UNREACHED, BucketQueue, Grid, IndexedPriorityQueue, NoSolution, Solution
+from .stream import CellStream, drain
+
+
+class DijkstraSearch:
+    @staticmethod
+    def search(
+        grid: Grid,
+        beam_width: int = 3,
+        frontier_type: type[IndexedPriorityQueue | BucketQueue] = IndexedPriorityQueue,
+    ) -> Solution:
+        return drain(DijkstraSearch.stream(grid, beam_width, frontier_type))
+
+    @staticmethod
+    def stream(
+        grid: Grid,
+        beam_width: int = 3,
+        frontier_type: type[IndexedPriorityQueue | BucketQueue] = IndexedPriorityQueue,
+    ) -> CellStream:
+        moves, steps, costs = grid.moves, grid.steps, grid.costs
+        start = grid.index(grid.start)
+        goal = grid.index(grid.end)
+
+        # Chi phí tốt nhất đã biết từ ô bắt đầu tới mỗi ô
+        distances = array("i", [UNREACHED]) * grid.size
+        parents = array("i", [-1]) * grid.size
+        settled = bytearray(grid.size)
+        distances[start] = 0
+
+        frontier = frontier_type()
+        frontier.push(start, 0)
+        explored = []
+        trace = tracing.active()
+
+        while frontier:
+            # Lấy ô có chi phí nhỏ nhất, chi phí của ô này đã là tối ưu
+            cell = frontier.pop()
+            settled[cell] = 1
+            explored.append(cell)
+            if trace:
+                trace.expand(grid.position(cell))
+            yield cell
+            if cell == goal:
+                if trace:
+                    trace.goal(grid.position(cell))
+                return Solution.from_indices(
+                    grid, grid.walk_back(parents, cell), explored)
+
+            distance = distances[cell]
+            for _, offset in steps[moves[cell]]:
+                neighbour = cell + offset
+                if settled[neighbour]:
+                    continue
+
+                # Đi vào một ô tốn chi phí của chính ô đó
+                new_distance = distance + costs[neighbour]
+                if new_distance < distances[neighbour]:
+                    distances[neighbour] = new_distance
+                    parents[neighbour] = cell
+                    frontier.push(neighbour, new_distance)
+                    if trace:
+                        trace.generate(grid.position(neighbour))
+
+        return NoSolution.from_indices(grid, [], explored)
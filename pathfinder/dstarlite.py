@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from array import array
+
+from . import tracing
+from .models import UNREACHED, Grid, IndexedPriorityQueue, NoSolution, Solution
+
+
+class DStarLite:
+    """Search state of D* Lite kept between queries on the same grid
+
+    The planner is rooted at one endpoint and keeps, for every cell, its
+    cost ``g`` to or from the root and the one-step lookahead ``rhs``.
+    Queries after the other endpoint moved or cells were edited only
+    repair the cells whose values became inconsistent. When the root
+    itself moves while the other endpoint stays put (e.g. dragging the
+    goal), the planner re-roots at the still endpoint so the following
+    drags are incremental again.
+    """
+
+    def __init__(self, grid: Grid, root: int, from_start: bool) -> None:
+        self.grid = grid
+        self.root = root
+        # True: g là chi phí từ ô bắt đầu (gốc) tới ô; False: từ ô tới đích
+        self.from_start = from_start
+        self.agent = -1
+        self.km = 0
+
+        self.g = array("i", [UNREACHED]) * grid.size
+        self.rhs = array("i", [UNREACHED]) * grid.size
+        self.rhs[root] = 0
+        self.frontier = IndexedPriorityQueue()
+        self.frontier.push(root, (0, 0))
+        self.changed: set[int] = set()
+        grid.listeners.append(self.changed.add)
+
+    @classmethod
+    def of(cls, grid: Grid) -> DStarLite:
+        """Get the planner cached on a grid, rooted for the current endpoints
+
+        Args:
+            grid (Grid): Grid to plan on
+
+        Returns:
+            DStarLite: Planner ready for ``plan``
+        """
+        start = grid.index(grid.start)
+        goal = grid.index(grid.end)
+
+        planner: DStarLite | None = grid.cache.get("dstar")
+        if planner is not None:
+            root, agent = (start, goal) if planner.from_start else (goal, start)
+            if planner.root == root:
+                return planner
+
+            # Gốc đã bị di chuyển: dựng lại, lấy đầu mút còn đứng yên làm gốc
+            grid.listeners.remove(planner.changed.add)
+            if planner.agent == agent:
+                planner = cls(grid, agent, not planner.from_start)
+                grid.cache["dstar"] = planner
+                return planner
+
+        planner = grid.cache["dstar"] = cls(grid, goal, False)
+        return planner
+
+    def heuristic(self, cell: int) -> int:
+        row, col = divmod(cell, self.grid.width)
+        agent_row, agent_col = divmod(self.agent, self.grid.width)
+        return abs(row - agent_row) + abs(col - agent_col)
+
+    def key(self, cell: int) -> tuple[int, int]:
+        best = min(self.g[cell], self.rhs[cell])
+        return best + self.heuristic(cell) + self.km, best
+
+    def lookahead(self, cell: int) -> int:
+        """Best cost of a cell through its neighbours"""
+        grid, g = self.grid, self.g
+        if grid.walls[cell]:
+            return UNREACHED
+
+        best = UNREACHED
+        if self.from_start:
+            # Đi từ láng giềng vào ô: tốn chi phí của chính ô
+            for _, offset in grid.steps[grid.moves[cell]]:
+                if g[cell + offset] < best:
+                    best = g[cell + offset]
+            return best + grid.costs[cell] if best != UNREACHED else UNREACHED
+
+        # Đi từ ô sang láng giềng: tốn chi phí của láng giềng
+        for _, offset in grid.steps[grid.moves[cell]]:
+            neighbour = cell + offset
+            if g[neighbour] != UNREACHED and g[neighbour] + grid.costs[neighbour] < best:
+                best = g[neighbour] + grid.costs[neighbour]
+        return best
+
+    def update_cell(self, cell: int) -> None:
+        if cell != self.root:
+            self.rhs[cell] = self.lookahead(cell)
+
+        if cell in self.frontier:
+            self.frontier.remove(cell)
+        if self.g[cell] != self.rhs[cell]:
+            self.frontier.push(cell, self.key(cell))
+
+    def plan(self) -> list[int]:
+        """Bring the values up to date for the current endpoints and edits
+
+        Returns:
+            list[int]: Cells expanded by this call
+        """
+        grid = self.grid
+        agent = grid.index(grid.start if not self.from_start else grid.end)
+        if self.agent != agent:
+            # Đầu mút di động đã đổi chỗ: tăng km thay vì tính lại mọi khoá
+            last, self.agent = self.agent, agent
+            if last != -1:
+                self.km += self.heuristic(last)
+
+        # Sửa các ô bị thay đổi và láng giềng của chúng
+        width, height = grid.width, grid.height
+        dirty = set()
+        for cell in self.changed:
+            row, col = divmod(cell, width)
+            dirty.add(cell)
+            if row > 0:
+                dirty.add(cell - width)
+            if row < height - 1:
+                dirty.add(cell + width)
+            if col > 0:
+                dirty.add(cell - 1)
+            if col < width - 1:
+                dirty.add(cell + 1)
+        self.changed.clear()
+        for cell in dirty:
+            self.update_cell(cell)
+
+        g, rhs, frontier = self.g, self.rhs, self.frontier
+        explored = []
+        trace = tracing.active()
+
+        while frontier and (frontier.priority(frontier.peek()) < self.key(agent)
+                            or rhs[agent] != g[agent]):
+            cell = frontier.peek()
+            old_key = frontier.priority(cell)
+            new_key = self.key(cell)
+            if old_key < new_key:
+                frontier.push(cell, new_key)
+                continue
+
+            frontier.pop()
+            explored.append(cell)
+            if trace:
+                trace.expand(grid.position(cell))
+
+            if g[cell] > rhs[cell]:
+                g[cell] = rhs[cell]
+            else:
+                g[cell] = UNREACHED
+                self.update_cell(cell)
+
+            for _, offset in grid.steps[grid.moves[cell]]:
+                self.update_cell(cell + offset)
+
+        return explored
+
+    def path(self) -> list[int]:
+        """Follow the values greedily from the moving endpoint to the root"""
+        grid, g, costs = self.grid, self.g, self.grid.costs
+        cell = self.agent
+        if g[cell] == UNREACHED:
+            return []
+
+        path = [cell]
+        while cell != self.root and len(path) <= grid.size:
+            best, best_cost = -1, UNREACHED
+            for _, offset in grid.steps[grid.moves[cell]]:
+                neighbour = cell + offset
+                if g[neighbour] == UNREACHED:
+                    continue
+
+                cost = g[neighbour] if self.from_start else g[neighbour] + costs[neighbour]
+                if cost < best_cost:
+                    best, best_cost = neighbour, cost
+
+            if best == -1:
+                return []
+            cell = best
+            path.append(cell)
+
+        if self.from_start:
+            path.reverse()
+        return path
+
+
+class DStarLiteSearch:
+    @staticmethod
+    def search(grid: Grid, _: int = 3) -> Solution:
+        planner = DStarLite.of(grid)
+        explored = planner.plan()
+        path = planner.path()
+
+        trace = tracing.active()
+        if trace and path:
+            trace.goal(grid.end)
+
+        # explored chỉ gồm các ô được sửa lại trong lần gọi này; khi không
+        # có ô nào phải sửa thì đường đi được đọc lại, nên báo các ô trên đường
+        if not explored:
+            explored = path
+        if not path:
+            return NoSolution.from_indices(grid, [], explored)
+        return Solution.from_indices(grid, path, explored)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from array import array
+
+from .models import UNREACHED, BucketQueue, Grid
+
+
+class DistanceField:
+    """Cost from every cell to one goal, from a single reverse search
+
+    Following the field downhill from any start gives a shortest path
+    in O(path length), so a field stays useful for as long as the goal
+    and the grid do not change. ``of`` keeps one field per grid, keyed
+    by the grid version and the goal.
+    """
+
+    def __init__(self, grid: Grid, goal: int) -> None:
+        self.grid = grid
+        self.goal = goal
+        self.version = grid.version
+        self.distances = array("I", [UNREACHED]) * grid.size
+        self.blank: array | None = None
+        self.build()
+
+    def retarget(self, goal: int) -> None:
+        """Rebuild the field for another goal, reusing its buffer
+
+        Args:
+            goal (int): Index of the new goal
+        """
+        self.goal = goal
+        self.version = self.grid.version
+        # Chép đè từ một mảng trống cấp phát một lần, không tạo mảng mới mỗi đích
+        if self.blank is None:
+            self.blank = array("I", [UNREACHED]) * self.grid.size
+        self.distances[:] = self.blank
+        self.build()
+
+    @classmethod
+    def of(cls, grid: Grid) -> DistanceField:
+        """Get the field of the grid's current goal, rebuilding it if stale
+
+        Args:
+            grid (Grid): Grid to follow
+
+        Returns:
+            DistanceField: Up-to-date field
+        """
+        goal = grid.index(grid.end)
+        field: DistanceField | None = grid.cache.get("field")
+        if field is None or field.goal != goal or field.version != grid.version:
+            field = grid.cache["field"] = cls(grid, goal)
+
+        return field
+
+    def build(self) -> None:
+        grid, distances = self.grid, self.distances
+        moves, steps, costs = grid.moves, grid.steps, grid.costs
+
+        # Dijkstra ngược từ ô đích: đi từ ô sang láng giềng tốn chi phí
+        # của láng giềng, nên chi phí của ô được cộng khi lan ra từ nó
+        distances[self.goal] = 0
+        frontier = BucketQueue()
+        frontier.push(self.goal, 0)
+
+        while frontier:
+            cell = frontier.pop()
+            distance = distances[cell] + costs[cell]
+            for _, offset in steps[moves[cell]]:
+                neighbour = cell + offset
+                if distance < distances[neighbour]:
+                    distances[neighbour] = distance
+                    frontier.push(neighbour, distance)
+
+    def path(self, start: int) -> list[int]:
+        """Follow the field from a start cell down to the goal
+
+        Args:
+            start (int): Index of the start cell
+
+        Returns:
+            list[int]: Cell indices from start to goal, empty if unreachable
+        """
+        grid, distances, costs = self.grid, self.distances, self.grid.costs
+        if distances[start] == UNREACHED:
+            return []
+
+        cell = start
+        path = [cell]
+        while cell != self.goal:
+            # Ô kế tiếp là láng giềng nằm trên một đường ngắn nhất
+            target = distances[cell]
+            for _, offset in grid.steps[grid.moves[cell]]:
+                neighbour = cell + offset
+                if distances[neighbour] + costs[neighbour] == target:
+                    cell = neighbour
+                    break
+            path.append(cell)
+
+        return path
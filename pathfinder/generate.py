@@ -0,0 +1,270 @@
+"""Maze generation without pygame
+
+Every generator draws on a ``Canvas``: the finished maze is read from its
+flat cost/wall buffers and, when recording, ``events`` lists every cell
+change in order so the UI can replay the generation as an animation.
+"""
+from __future__ import annotations
+
+import random
+from array import array
+from enum import Enum
+from typing import Callable, NamedTuple
+
+from .models import CompactGrid
+
+WEIGHTS = [1, 2, 3, 4, 5, 6, 7, 8]
+
+
+class Step(Enum):
+    WALL = "wall"
+    PASSAGE = "passage"
+    CELL = "cell"
+    WEIGHT = "weight"
+
+
+class MazeEvent(NamedTuple):
+    position: tuple[int, int]
+    value: str
+    step: Step
+
+
+class Canvas:
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        start: tuple[int, int],
+        goal: tuple[int, int],
+        fill: str = "1",
+        record: bool = False
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.start = start
+        self.goal = goal
+        self.fill = fill
+
+        wall = fill == "#"
+        self.costs = array("i", [-1 if wall else int(fill)]) * (width * height)
+        self.walls = bytearray([wall]) * (width * height)
+        self.events: list[MazeEvent] | None = [] if record else None
+
+        # Ô bắt đầu và ô đích luôn để trống, giống Maze.set_cell
+        for row, col in (start, goal):
+            self.costs[row * width + col] = 1
+            self.walls[row * width + col] = 0
+
+    def set(self, pos: tuple[int, int], value: str, step: Step) -> None:
+        """Change a cell, ignoring the start and the goal
+
+        Args:
+            pos (tuple[int, int]): Position of the cell
+            value (str): "#" for a wall, otherwise the weight
+            step (Step): Kind of change, used to pick the animation
+        """
+        if pos == self.start or pos == self.goal:
+            return
+
+        index = pos[0] * self.width + pos[1]
+        if value == "#":
+            self.costs[index] = -1
+            self.walls[index] = 1
+        else:
+            self.costs[index] = int(value)
+            self.walls[index] = 0
+
+        if self.events is not None:
+            self.events.append(MazeEvent(pos, value, step))
+
+    def is_wall(self, pos: tuple[int, int]) -> bool:
+        return bool(self.walls[pos[0] * self.width + pos[1]])
+
+    def is_valid(self, pos: tuple[int, int]) -> bool:
+        return 0 <= pos[0] < self.height and 0 <= pos[1] < self.width
+
+    def two_step_neighbours(self, cell: tuple[int, int]) -> list[tuple[int, int]]:
+        row, col = cell
+        return [neighbour for neighbour in ((row + 2, col), (row - 2, col),
+                                            (row, col + 2), (row, col - 2))
+                if self.is_valid(neighbour)]
+
+    def grid(self) -> CompactGrid:
+        return CompactGrid(self.width, self.height, array("i", self.costs),
+                           bytearray(self.walls), self.start, self.goal)
+
+
+def randomised_prims(canvas: Canvas, rng: random.Random) -> None:
+    """Carve passages from the start by randomised Prim's algorithm"""
+    frontier = [cell for cell in canvas.two_step_neighbours(canvas.start)
+                if canvas.is_wall(cell)]
+    visited = set()
+
+    while frontier:
+        # Lấy ngẫu nhiên một ô, đổi chỗ với ô cuối để xoá trong O(1)
+        index = rng.randrange(len(frontier))
+        frontier[index], frontier[-1] = frontier[-1], frontier[index]
+        cell = frontier.pop()
+        if cell in visited:
+            continue
+
+        # Phá tường giữa ô này và một ô đã mở cách nó hai bước
+        neighbours = [neighbour for neighbour in canvas.two_step_neighbours(cell)
+                      if not canvas.is_wall(neighbour)]
+        if neighbours:
+            neighbour = rng.choice(neighbours)
+            wall = ((cell[0] + neighbour[0]) // 2, (cell[1] + neighbour[1]) // 2)
+            canvas.set(wall, "1", Step.PASSAGE)
+            canvas.set(cell, "1", Step.CELL)
+
+            frontier.extend(neighbour for neighbour in canvas.two_step_neighbours(cell)
+                            if canvas.is_wall(neighbour))
+
+        visited.add(cell)
+
+
+def randomised_dfs(canvas: Canvas, rng: random.Random) -> None:
+    """Carve weighted passages from the start by randomised depth-first search"""
+    stack = [canvas.start]
+    visited = {canvas.start}
+
+    while stack:
+        current = stack.pop()
+
+        unvisited = [neighbour for neighbour in canvas.two_step_neighbours(current)
+                     if neighbour not in visited]
+        if unvisited:
+            following = rng.choice(unvisited)
+            stack.append(current)
+
+            canvas.set(following, str(rng.choice(WEIGHTS)), Step.CELL)
+            wall = ((current[0] + following[0]) // 2, (current[1] + following[1]) // 2)
+            canvas.set(wall, str(rng.choice(WEIGHTS)), Step.PASSAGE)
+
+            visited.add(following)
+            stack.append(following)
+
+
+def basic_weight_maze(canvas: Canvas, rng: random.Random) -> None:
+    """Give about three cells in ten a random weight"""
+    for col in range(canvas.width):
+        for row in range(canvas.height):
+            if rng.randint(1, 10) < 8:
+                continue
+
+            canvas.set((row, col), str(rng.choice(WEIGHTS)), Step.WEIGHT)
+
+
+def basic_random_maze(canvas: Canvas, rng: random.Random) -> None:
+    """Turn about three cells in ten into walls"""
+    for col in range(canvas.width):
+        for row in range(canvas.height):
+            if rng.randint(1, 10) < 8:
+                continue
+
+            canvas.set((row, col), "#", Step.WALL)
+
+
+def recursive_division(canvas: Canvas, rng: random.Random) -> None:
+    """Wall the border, then split the chambers by walls with one hole each"""
+    width, height = canvas.width, canvas.height
+    for col in range(width):
+        canvas.set((0, col), "#", Step.WALL)
+    for col in range(width):
+        canvas.set((height - 1, col), "#", Step.WALL)
+    for row in range(height):
+        canvas.set((row, 0), "#", Step.WALL)
+        canvas.set((row, width - 1), "#", Step.WALL)
+
+    # Ngăn xếp thay cho đệ quy, giữ nguyên thứ tự chia các khoang
+    chambers = [(1, width - 2, 1, height - 2)]
+    while chambers:
+        x1, x2, y1, y2 = chambers.pop()
+        if x2 - x1 < 1 or y2 - y1 < 1:
+            continue
+
+        # Chia theo chiều dài hơn của khoang
+        horizontal = True if y2 - y1 > x2 - x1 else (
+            False if x2 - x1 != y2 - y1 else rng.choice((True, False)))
+
+        if horizontal:
+            y = _draw_line(canvas, rng, y1, y2, x1, x2, horizontal=True)
+            if y != -1:
+                chambers.extend([(x1, x2, y + 1, y2), (x1, x2, y1, y - 1)])
+        else:
+            x = _draw_line(canvas, rng, x1, x2, y1, y2)
+            if x != -1:
+                chambers.extend([(x + 1, x2, y1, y2), (x1, x - 1, y1, y2)])
+
+
+def _draw_line(
+    canvas: Canvas,
+    rng: random.Random,
+    a1: int,
+    a2: int,
+    b1: int,
+    b2: int,
+    horizontal: bool = False
+) -> int:
+    """Draw a wall at an even place of [a1, a2) with a hole at an odd place
+
+    Returns:
+        int: Coordinate of the wall line, -1 when the chamber cannot be split
+    """
+    # Tường ở vị trí chẵn, lỗ hổng ở vị trí lẻ
+    if a1 % 2 != 0:
+        a1 += 1
+    if b1 % 2 == 0:
+        b1 += 1
+    if a1 >= a2 or b1 >= b2:
+        return -1
+
+    wall = rng.randrange(a1, a2, 2)
+    hole = rng.randrange(b1, b2, 2)
+
+    for i in range(b1, b2 + 1):
+        if i == hole:
+            continue
+        canvas.set((wall, i) if horizontal else (i, wall), "#", Step.WALL)
+
+    return wall
+
+
+# Generator name -> (function, value every cell starts with)
+GENERATORS: dict[str, tuple[Callable[[Canvas, random.Random], None], str]] = {
+    "Recursive Division": (recursive_division, "1"),
+    "Prim's Algorithm": (randomised_prims, "#"),
+    "Randomised DFS": (randomised_dfs, "#"),
+    "Basic Weight Maze": (basic_weight_maze, "1"),
+    "Basic Random Maze": (basic_random_maze, "1"),
+}
+
+
+def generate(
+    algorithm: str,
+    width: int,
+    height: int,
+    start: tuple[int, int],
+    goal: tuple[int, int],
+    seed: int | None = None,
+    record: bool = False
+) -> Canvas:
+    """Generate a maze
+
+    Args:
+        algorithm (str): Name of the generator, a key of GENERATORS
+        width (int): Number of columns
+        height (int): Number of rows
+        start (tuple[int, int]): Start cell, always left open
+        goal (tuple[int, int]): Goal cell, always left open
+        seed (int | None, optional): Random seed. Defaults to None.
+        record (bool, optional): Keep the ordered cell changes in ``events``. Defaults to False.
+
+    Returns:
+        Canvas: Finished maze, see ``Canvas.grid``
+    """
+    function, fill = GENERATORS[algorithm]
+    canvas = Canvas(width, height, start, goal, fill, record)
+    function(canvas, random.Random(seed))
+
+    return canvas
@@ -0,0 +1,61 @@
+from array import array
+
+from . import tracing
+from .heuristics import manhattan
+from .models import Grid, IndexedPriorityQueue, NoSolution, Solution
+from .stream import CellStream, drain
+
+
+class GreedyBestFirstSearch:
+    @staticmethod
+    def search(grid: Grid, beam_width: int = 3) -> Solution:
+        return drain(GreedyBestFirstSearch.stream(grid, beam_width))
+
+    @staticmethod
+    def stream(grid: Grid, beam_width: int = 3) -> CellStream:
+        moves, steps, width = grid.moves, grid.steps, grid.width
+        start = grid.index(grid.start)
+        goal = grid.index(grid.end)
+        goal_row, goal_col = grid.end
+
+        parents = array("i", [-1]) * grid.size
+        seen = bytearray(grid.size)
+        seen[start] = 1
+
+        # Frontier ưu tiên theo khoảng cách ước lượng tới đích,
+        # hoà nhau thì ô được thêm trước sẽ được lấy trước
+        frontier = IndexedPriorityQueue()
+        order = 0
+        frontier.push(start, (manhattan(abs(grid.start[0] - goal_row),
+                                        abs(grid.start[1] - goal_col)), order))
+        explored = []
+        trace = tracing.active()
+
+        while frontier:
+            # Lấy ô có khoảng cách ước lượng nhỏ nhất
+            cell = frontier.pop()
+            explored.append(cell)
+            if trace:
+                trace.expand(grid.position(cell))
+            yield cell
+            if cell == goal:
+                if trace:
+                    trace.goal(grid.position(cell))
+                return Solution.from_indices(
+                    grid, grid.walk_back(parents, cell), explored)
+
+            for _, offset in steps[moves[cell]]:
+                neighbour = cell + offset
+                if seen[neighbour]:
+                    continue
+
+                seen[neighbour] = 1
+                parents[neighbour] = cell
+                row, col = divmod(neighbour, width)
+                order += 1
+                frontier.push(neighbour, (manhattan(abs(row - goal_row),
+                                                    abs(col - goal_col)), order))
+                if trace:
+                    trace.generate((row, col))
+
+        return NoSolution.from_indices(grid, [], explored)
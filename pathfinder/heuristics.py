@@ -0,0 +1,38 @@
+"""Distance estimates used by the informed searches
+
+Every estimate takes the absolute row and column distance between a cell
+and the goal. Cell costs in this project are at least 1, so on a
+4-connected grid none of them overestimates the remaining path cost.
+"""
+from enum import Enum
+from typing import Callable
+
+SQRT2_MINUS_1 = 2 ** 0.5 - 1
+
+
+class Heuristic(Enum):
+    MANHATTAN = "MANHATTAN"
+    OCTILE = "OCTILE"
+    ZERO = "ZERO"
+
+
+def manhattan(rows: int, cols: int) -> int:
+    return rows + cols
+
+
+def octile(rows: int, cols: int) -> float:
+    if rows > cols:
+        return rows + SQRT2_MINUS_1 * cols
+
+    return cols + SQRT2_MINUS_1 * rows
+
+
+def zero(rows: int, cols: int) -> int:
+    return 0
+
+
+HEURISTICS: dict[Heuristic, Callable[[int, int], float]] = {
+    Heuristic.MANHATTAN: manhattan,
+    Heuristic.OCTILE: octile,
+    Heuristic.ZERO: zero,
+}
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+from . import tracing
+from .models import Grid, IndexedPriorityQueue, NoSolution, Solution
+from .stream import CellStream, drain
+
+CLUSTER_SIZE = 10
+
+# Border runs shorter than this get one transition in the middle,
+# longer runs get one at each end
+WIDE_ENTRANCE = 6
+
+
+class ClusterGraph:
+    """Abstract graph used by hierarchical pathfinding (HPA*)
+
+    The grid is cut into square clusters. Wherever two neighbouring
+    clusters share open border cells, transition cells are picked on both
+    sides; these entrances are the abstract nodes. Entrances of the same
+    cluster are joined by their shortest path cost inside the cluster and
+    facing entrances of two clusters by a single step.
+
+    The graph is cached on the grid and listens to its edits: only the
+    clusters touched since the last query (and neighbours whose entrances
+    moved because of them) are rebuilt.
+    """
+
+    def __init__(self, grid: Grid, cluster_size: int = CLUSTER_SIZE) -> None:
+        self.grid = grid
+        self.size = cluster_size
+        self.columns = -(-grid.width // cluster_size)
+        self.rows = -(-grid.height // cluster_size)
+
+        # Transition pairs of every border, keyed by the two cluster ids
+        self.transitions: dict[tuple[int, int], list[tuple[int, int]]] = {}
+        # Entrance cells of every cluster and the costs between them
+        self.entrances: dict[int, set[int]] = {}
+        self.intra: dict[int, dict[int, dict[int, int]]] = {}
+        # Cells across a border reachable from an entrance in one step
+        self.links: dict[int, list[int]] = {}
+
+        self.dirty: set[int] = set(range(self.rows * self.columns))
+        grid.listeners.append(self._touch)
+
+    @classmethod
+    def of(cls, grid: Grid) -> ClusterGraph:
+        """Get the up-to-date cluster graph cached on a grid
+
+        Args:
+            grid (Grid): Grid to abstract
+
+        Returns:
+            ClusterGraph: Cluster graph of the grid
+        """
+        graph = grid.cache.get("clusters")
+        if graph is None:
+            graph = grid.cache["clusters"] = cls(grid)
+
+        graph.update()
+        return graph
+
+    def cluster_of(self, index: int) -> int:
+        row, col = divmod(index, self.grid.width)
+        return (row // self.size) * self.columns + col // self.size
+
+    def bounds(self, cluster: int) -> tuple[int, int, int, int]:
+        top = (cluster // self.columns) * self.size
+        left = (cluster % self.columns) * self.size
+
+        return (top, left,
+                min(top + self.size, self.grid.height),
+                min(left + self.size, self.grid.width))
+
+    def _touch(self, index: int) -> None:
+        self.dirty.add(self.cluster_of(index))
+
+    def _borders(self, cluster: int) -> list[tuple[int, int]]:
+        row, col = divmod(cluster, self.columns)
+
+        borders = []
+        if col > 0:
+            borders.append((cluster - 1, cluster))
+        if col < self.columns - 1:
+            borders.append((cluster, cluster + 1))
+        if row > 0:
+            borders.append((cluster - self.columns, cluster))
+        if row < self.rows - 1:
+            borders.append((cluster, cluster + self.columns))
+
+        return borders
+
+    def _find_transitions(self, border: tuple[int, int]) -> list[tuple[int, int]]:
+        grid = self.grid
+        first, second = border
+        top, left, bottom, right = self.bounds(first)
+
+        # Pairs of facing cells along the border
+        if second == first + 1 and self.columns > 1:
+            pairs = [(row * grid.width + right - 1, row * grid.width + right)
+                     for row in range(top, bottom)]
+        else:
+            pairs = [((bottom - 1) * grid.width + col, bottom * grid.width + col)
+                     for col in range(left, right)]
+
+        transitions = []
+        run: list[tuple[int, int]] = []
+        for pair in pairs + [(-1, -1)]:
+            if pair[0] != -1 and not grid.walls[pair[0]] and not grid.walls[pair[1]]:
+                run.append(pair)
+                continue
+
+            if len(run) >= WIDE_ENTRANCE:
+                transitions.extend((run[0], run[-1]))
+            elif run:
+                transitions.append(run[len(run) // 2])
+            run = []
+
+        return transitions
+
+    def update(self) -> None:
+        """Rebuild the parts of the graph touched by grid edits"""
+        if not self.dirty:
+            return
+
+        dirty, self.dirty = self.dirty, set()
+        borders = {border for cluster in dirty for border in self._borders(cluster)}
+
+        touched = set(dirty)
+        for border in borders:
+            for first, second in self.transitions.get(border, []):
+                self.links[first].remove(second)
+                self.links[second].remove(first)
+
+            self.transitions[border] = self._find_transitions(border)
+            for first, second in self.transitions[border]:
+                self.links.setdefault(first, []).append(second)
+                self.links.setdefault(second, []).append(first)
+
+            touched.update(border)
+
+        for cluster in touched:
+            entrances = set()
+            for border in self._borders(cluster):
+                side = 0 if border[0] == cluster else 1
+                entrances.update(pair[side] for pair in self.transitions.get(border, []))
+
+            if cluster in dirty or entrances != self.entrances.get(cluster):
+                self.entrances[cluster] = entrances
+                self.intra[cluster] = {
+                    entrance: {other: cost
+                               for other, cost in self.local_costs(entrance).items()
+                               if other in entrances and other != entrance}
+                    for entrance in entrances
+                }
+
+        self.links = {cell: others for cell, others in self.links.items() if others}
+
+    def local_search(
+        self,
+        source: int,
+        target: int = -1
+    ) -> tuple[dict[int, int], dict[int, int]]:
+        """Dijkstra restricted to the cluster of the source cell
+
+        Args:
+            source (int): Cell to start from
+            target (int, optional): Stop once this cell is settled. Defaults to -1.
+
+        Returns:
+            tuple[dict[int, int], dict[int, int]]: Costs and parents of the reached cells
+        """
+        grid = self.grid
+        moves, steps, costs, width = grid.moves, grid.steps, grid.costs, grid.width
+        top, left, bottom, right = self.bounds(self.cluster_of(source))
+
+        distances = {source: 0}
+        parents = {source: -1}
+        frontier = IndexedPriorityQueue()
+        frontier.push(source, 0)
+        settled = set()
+
+        while frontier:
+            cell = frontier.pop()
+            settled.add(cell)
+            if cell == target:
+                break
+
+            distance = distances[cell]
+            for _, offset in steps[moves[cell]]:
+                neighbour = cell + offset
+                row, col = divmod(neighbour, width)
+                if neighbour in settled or not (top <= row < bottom and left <= col < right):
+                    continue
+
+                new_distance = distance + costs[neighbour]
+                if new_distance < distances.get(neighbour, new_distance + 1):
+                    distances[neighbour] = new_distance
+                    parents[neighbour] = cell
+                    frontier.push(neighbour, new_distance)
+
+        return distances, parents
+
+    def local_costs(self, source: int) -> dict[int, int]:
+        return self.local_search(source)[0]
+
+    def refine(self, source: int, target: int) -> list[int]:
+        """Concrete cells from source (excluded) to target along an abstract edge"""
+        if self.cluster_of(source) != self.cluster_of(target):
+            return [target]
+
+        _, parents = self.local_search(source, target)
+        cells = []
+        while target != source:
+            cells.append(target)
+            target = parents[target]
+
+        cells.reverse()
+        return cells
+
+
+class HierarchicalAStarSearch:
+    @staticmethod
+    def search(grid: Grid, beam_width: int = 3) -> Solution:
+        return drain(HierarchicalAStarSearch.stream(grid, beam_width))
+
+    @staticmethod
+    def stream(grid: Grid, beam_width: int = 3) -> CellStream:
+        graph = ClusterGraph.of(grid)
+        costs, width = grid.costs, grid.width
+        start = grid.index(grid.start)
+        goal = grid.index(grid.end)
+        goal_row, goal_col = grid.end
+        trace = tracing.active()
+
+        # Nối ô bắt đầu và ô đích vào đồ thị trừu tượng bằng tìm kiếm cục bộ
+        # trong cụm của chúng. Chi phí đi ngược e -> đích suy ra từ chi phí
+        # đích -> e vì cả hai dùng cùng một đường
+        start_cluster = graph.cluster_of(start)
+        goal_cluster = graph.cluster_of(goal)
+        from_start = graph.local_costs(start)
+        start_edges = {cell: cost for cell, cost in from_start.items()
+                       if cell in graph.entrances[start_cluster] or cell == goal}
+        start_edges.pop(start, None)
+        to_goal = {cell: cost - costs[cell] + costs[goal]
+                   for cell, cost in graph.local_costs(goal).items()
+                   if cell in graph.entrances[goal_cluster]}
+
+        distances = {start: 0}
+        parents = {start: -1}
+        closed = set()
+        frontier = IndexedPriorityQueue()
+        frontier.push(start, (0, 0))
+        explored = []
+
+        while frontier:
+            cell = frontier.pop()
+            closed.add(cell)
+            explored.append(cell)
+            if trace:
+                trace.expand(grid.position(cell))
+            yield cell
+            if cell == goal:
+                if trace:
+                    trace.goal(grid.position(cell))
+
+                # Làm mịn từng cạnh trừu tượng thành đường đi trên lưới
+                points = []
+                while cell != -1:
+                    points.append(cell)
+                    cell = parents[cell]
+                points.reverse()
+
+                path = [start]
+                for source, target in zip(points, points[1:]):
+                    path.extend(graph.refine(source, target))
+
+                return Solution.from_indices(grid, path, explored)
+
+            if cell == start:
+                edges = dict(start_edges)
+            else:
+                edges = dict(graph.intra.get(graph.cluster_of(cell), {}).get(cell, {}))
+            for other in graph.links.get(cell, []):
+                edges[other] = costs[other]
+            if cell in to_goal:
+                edges[goal] = to_goal[cell]
+
+            distance = distances[cell]
+            for neighbour, cost in edges.items():
+                if neighbour in closed:
+                    continue
+
+                g = distance + cost
+                if g >= distances.get(neighbour, g + 1):
+                    continue
+
+                distances[neighbour] = g
+                parents[neighbour] = cell
+                row, col = divmod(neighbour, width)
+                frontier.push(neighbour, (g + abs(row - goal_row) + abs(col - goal_col), -g))
+                if trace:
+                    trace.generate((row, col))
+
+        return NoSolution.from_indices(grid, [], explored)
@@ -0,0 +1,237 @@
+from array import array
+from collections import Counter
+from itertools import compress
+
+from . import tracing
+from .astar import AStarSearch
+from .models import UNREACHED, Grid, IndexedPriorityQueue, NoSolution, Solution
+from .stream import CellStream, drain
+
+# Đảo 0 <-> 1 để biến bitmap tường thành bitmap ô đi được
+OPEN = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+
+
+class JumpPointSearch:
+    """Jump Point Search for 4-connected grids
+
+    Symmetric paths through uniform-cost areas are pruned by jumping in
+    straight lines and only stopping at cells with forced neighbours.
+    Pruning is only sound when every cell costs the same, so grids with
+    weighted cells are handed to A* instead.
+    """
+
+    @staticmethod
+    def search(grid: Grid, beam_width: int = 3) -> Solution:
+        return drain(JumpPointSearch.stream(grid, beam_width))
+
+    @staticmethod
+    def stream(grid: Grid, beam_width: int = 3) -> CellStream:
+        start = grid.index(grid.start)
+        goal = grid.index(grid.end)
+
+        # Chi phí của ô bắt đầu và ô đích không ảnh hưởng tới việc chọn đường
+        counts, maps = JumpPointSearch._prepare(grid)
+        endpoints = Counter(grid.costs[index] for index in {start, goal}
+                            if not grid.walls[index])
+        terrain = {cost for cost, count in counts.items() if count > endpoints[cost]}
+        if len(terrain) > 1:
+            return (yield from AStarSearch.stream(grid, beam_width))
+        step_cost = terrain.pop() if terrain else 1
+
+        width, height, walls, size = grid.width, grid.height, grid.walls, grid.size
+        goal_row, goal_col = grid.end
+
+        right, left, down, up = (bytearray(stops) for stops in maps)
+        right[goal] = left[goal] = down[goal] = up[goal] = 1
+        # Kết quả các bước nhảy ngang, -2 là chưa tính; dùng lại trong cả lần tìm kiếm
+        right_jumps = array("i", [-2]) * grid.size
+        left_jumps = array("i", [-2]) * grid.size
+
+        def jump_right(index: int) -> int:
+            if (point := right_jumps[index]) == -2:
+                # Tìm điểm dừng đầu tiên trong phần còn lại của hàng bằng bytes.find
+                point = right.find(1, index, index - index % width + width)
+                if point != -1 and walls[point]:
+                    point = -1
+                right_jumps[index] = point
+            return point
+
+        def jump_left(index: int) -> int:
+            if (point := left_jumps[index]) == -2:
+                point = left.rfind(1, index - index % width, index + 1)
+                if point != -1 and walls[point]:
+                    point = -1
+                left_jumps[index] = point
+            return point
+
+        def jump(row: int, col: int, d_row: int, d_col: int) -> int:
+            # Đi thẳng theo một hướng cho tới khi gặp ô đích, tường
+            # hoặc một ô có láng giềng bắt buộc (jump point)
+            if not (0 <= row < height and 0 <= col < width):
+                return -1
+            index = row * width + col
+            if d_col == 1:
+                return jump_right(index)
+            if d_col == -1:
+                return jump_left(index)
+
+            stops = down if d_row == 1 else up
+            step = d_row * width
+            while 0 <= index < size:
+                if walls[index]:
+                    return -1
+                if stops[index]:
+                    return index
+
+                # Khi đi dọc phải dừng ở những ô có jump point theo chiều ngang
+                col = index % width
+                if (col + 1 < width and jump_right(index + 1) != -1) \
+                        or (col > 0 and jump_left(index - 1) != -1):
+                    return index
+                index += step
+
+            return -1
+
+        distances = array("i", [UNREACHED]) * grid.size
+        parents = array("i", [-1]) * grid.size
+        closed = bytearray(grid.size)
+        distances[start] = 0
+
+        frontier = IndexedPriorityQueue()
+        frontier.push(start, (0, 0))
+        explored = []
+        trace = tracing.active()
+
+        while frontier:
+            cell = frontier.pop()
+            closed[cell] = 1
+            explored.append(cell)
+            if trace:
+                trace.expand(grid.position(cell))
+            yield cell
+            if cell == goal:
+                if trace:
+                    trace.goal(grid.position(cell))
+                return Solution.from_indices(
+                    grid, JumpPointSearch._expand(grid, parents, cell), explored)
+
+            row, col = divmod(cell, width)
+
+            # Chỉ xét các hướng không bị cắt tỉa so với hướng đi từ ô cha
+            parent = parents[cell]
+            if parent == -1:
+                directions = ((-1, 0), (1, 0), (0, -1), (0, 1))
+            else:
+                parent_row, parent_col = divmod(parent, width)
+                d_row = (row > parent_row) - (row < parent_row)
+                d_col = (col > parent_col) - (col < parent_col)
+                if d_col:
+                    directions = ((-1, 0), (1, 0), (0, d_col))
+                else:
+                    directions = ((0, -1), (0, 1), (d_row, 0))
+
+            distance = distances[cell]
+            for d_row, d_col in directions:
+                point = jump(row + d_row, col + d_col, d_row, d_col)
+                if point == -1 or closed[point]:
+                    continue
+
+                point_row, point_col = divmod(point, width)
+                g = distance + step_cost * (abs(point_row - row) + abs(point_col - col))
+                if g >= distances[point]:
+                    continue
+
+                distances[point] = g
+                parents[point] = cell
+                h = step_cost * (abs(point_row - goal_row) + abs(point_col - goal_col))
+                frontier.push(point, (g + h, -g))
+                if trace:
+                    trace.generate((point_row, point_col))
+
+        return NoSolution.from_indices(grid, [], explored)
+
+    @staticmethod
+    def _prepare(grid: Grid) -> tuple[Counter, tuple[bytes, bytes, bytes, bytes]]:
+        """Costs of the open cells and the stop maps, cached until the grid changes
+
+        Args:
+            grid (Grid): Grid being searched
+
+        Returns:
+            tuple[Counter, tuple[bytes, bytes, bytes, bytes]]: Cell count per
+                open cell cost, and the maps of ``_stops``
+        """
+        cached = grid.cache.get("jps")
+        if cached is None or cached[0] != grid.version:
+            passable = grid.walls.translate(OPEN)
+            costs = set(compress(grid.costs, passable))
+            if len(costs) == 1:
+                # Lưới đồng nhất: chỉ cần đếm số ô đi được, nhanh hơn Counter
+                counts = Counter({costs.pop(): passable.count(1)})
+            else:
+                counts = Counter(compress(grid.costs, passable))
+            cached = grid.cache["jps"] = (grid.version, counts, JumpPointSearch._stops(grid))
+
+        return cached[1], cached[2]
+
+    @staticmethod
+    def _stops(grid: Grid) -> tuple[bytes, bytes, bytes, bytes]:
+        """Cells where a jump to the right, left, down or up has to stop
+
+        A cell is marked when it is a wall or has a forced neighbour for
+        that direction; the goal is added per search. Each cell takes one
+        byte of a big integer, so shifting by ``8 * k`` moves the whole grid
+        k cells and the four maps cost a few whole-grid integer operations.
+
+        Args:
+            grid (Grid): Grid being searched
+
+        Returns:
+            tuple[bytes, bytes, bytes, bytes]: One 0/1 byte per cell for each direction
+        """
+        width, size = grid.width, grid.size
+        ones = int.from_bytes(b"\x01" * size, "little")
+        not_first = int.from_bytes((b"\x00" + b"\x01" * (width - 1)) * grid.height, "little")
+        not_last = int.from_bytes((b"\x01" * (width - 1) + b"\x00") * grid.height, "little")
+
+        walls = int.from_bytes(grid.walls, "little")
+        passable = ones ^ walls
+
+        def at(offset: int, mask: int) -> int:
+            # Ô cell + offset có đi được không, cho mọi ô cùng lúc
+            shifted = passable >> 8 * offset if offset > 0 else passable << -8 * offset
+            return shifted & mask
+
+        above, below = at(-width, ones), at(width, ones)
+        west, east = at(-1, not_first), at(1, not_last)
+        above_west, above_east = at(-width - 1, not_first), at(-width + 1, not_last)
+        below_west, below_east = at(width - 1, not_first), at(width + 1, not_last)
+
+        def blocked(open_: int) -> int:
+            return ones ^ open_
+
+        right, left, down, up = (
+            ((forced | walls).to_bytes(size, "little")) for forced in (
+                (above & blocked(above_west)) | (below & blocked(below_west)),
+                (above & blocked(above_east)) | (below & blocked(below_east)),
+                (west & blocked(above_west)) | (east & blocked(above_east)),
+                (west & blocked(below_west)) | (east & blocked(below_east)),
+            ))
+
+        return right, left, down, up
+
+    @staticmethod
+    def _expand(grid: Grid, parents: array, cell: int) -> list[int]:
+        """Fill in the straight segments between consecutive jump points"""
+        points = grid.walk_back(parents, cell)
+        cells = [points[0]]
+
+        for point in points[1:]:
+            previous = cells[-1]
+            if point // grid.width == previous // grid.width:
+                step = 1 if point > previous else -1
+            else:
+                step = grid.width if point > previous else -grid.width
+            cells.extend(range(previous + step, point + step, step))
+
+        return cells
@@ -1,54 +1,71 @@
-from .models import Grid, QueueFrontier, NoSolution, Solution
-from typing import List
+import heapq
+from array import array
+
+from . import tracing
+from .models import Grid, NoSolution, Solution
+from .stream import CellStream, drain
 
 
 class LocalBeamSearch:
     @staticmethod
     def search(grid: Grid, beam_width: int = 3) -> Solution:
-        # Khởi tạo beam với một nút duy nhất (vị trí bắt đầu)
-        initial_node = grid.get_node(pos=grid.start)
-        beam = [initial_node]
+        return drain(LocalBeamSearch.stream(grid, beam_width))
+
+    @staticmethod
+    def stream(grid: Grid, beam_width: int = 3) -> CellStream:
+        moves, steps, costs = grid.moves, grid.steps, grid.costs
+        goal = grid.index(grid.end)
 
-        # Tạo dict để lưu trữ các trạng thái đã được khám phá
-        explored_states = {}
+        # Mảng cha và bitmap các ô đã khám phá riêng cho lần tìm kiếm này.
+        # layers ghi lớp gần nhất đã sinh ra mỗi ô để bỏ các ô trùng lặp
+        parents = array("i", [-1]) * grid.size
+        explored_cells = bytearray(grid.size)
+        layers = array("i", [-1]) * grid.size
+        explored = []
+        trace = tracing.active()
+
+        # Khởi tạo beam với một ô duy nhất (vị trí bắt đầu)
+        beam = [grid.index(grid.start)]
+        layer = 0
 
         while True:
             next_beam = []  # Tạo beam mới
 
-            for node in beam:
-                # Nếu nút hiện tại là nút đích, tạo đường đi và trả về một đối tượng Solution
-                if node.state == grid.end:
-                    # Tạo danh sách các ô đã đi qua
-                    cells = []
-                    path_cost = 0
-                    temp = node
-                    while temp.parent is not None:
-                        cells.append(temp.state)
-                        path_cost += temp.cost
-                        temp = temp.parent
-                    cells.append(grid.start)
-                    cells.reverse()
-                    return Solution(cells, list(explored_states), path_cost=path_cost)
-
-                # Xác định các nút láng giềng của nút hiện tại
-                for action, state in grid.get_neighbours(node.state).items():
-                    if state in explored_states:
+            for cell in beam:
+                # Nếu ô hiện tại là ô đích, tạo đường đi và trả về một đối tượng Solution
+                if cell == goal:
+                    if trace:
+                        trace.goal(grid.position(cell))
+                    return Solution.from_indices(
+                        grid, grid.walk_back(parents, cell), explored)
+
+                # Xác định các ô láng giềng của ô hiện tại, mỗi ô chỉ một lần mỗi lớp
+                for _, offset in steps[moves[cell]]:
+                    neighbour = cell + offset
+                    if explored_cells[neighbour] or layers[neighbour] == layer:
                         continue
-                    new_node = grid.get_node(pos=state)
-                    new_node.parent = node
-                    new_node.action = action
-                    next_beam.append(new_node)
+                    layers[neighbour] = layer
+                    parents[neighbour] = cell
+                    next_beam.append(neighbour)
+                    if trace:
+                        trace.generate(grid.position(neighbour))
 
-                # Thêm trạng thái hiện tại vào explored_states
-                explored_states[node.state] = True
-            
+                # Đánh dấu ô hiện tại là đã khám phá
+                if not explored_cells[cell]:
+                    explored_cells[cell] = 1
+                    explored.append(cell)
+                    yield cell
+                if trace:
+                    trace.expand(grid.position(cell))
 
-            # Sắp xếp các nút trong beam tăng dần theo cost (chi phí)
-            next_beam.sort(key=lambda n: n.cost)
-            # Giữ lại beam_width nút có chi phí thấp nhất
-            beam = next_beam[:beam_width]
+            # Giữ lại beam_width ô có chi phí thấp nhất bằng heap, chỉ khi
+            # lớp mới rộng hơn beam; nsmallest ổn định như sort rồi cắt
+            if len(next_beam) > beam_width:
+                beam = heapq.nsmallest(beam_width, next_beam, key=costs.__getitem__)
+            else:
+                beam = next_beam
+            layer += 1
 
-            # Nếu không còn nút nào trong beam, trả về NoSolution
+            # Nếu không còn ô nào trong beam, trả về NoSolution
             if not beam:
-                return NoSolution([], list(explored_states))
-
+                return NoSolution.from_indices(grid, [], explored)
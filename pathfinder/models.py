@@ -1,6 +1,8 @@
 from __future__ import annotations
-from heapq import heappush, heappop
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
 from enum import Enum
+from typing import Any, Callable, overload
 
 
 class Node:
@@ -29,59 +31,235 @@ class Node:
         return f"Node({self.state!r}, Node(...), {self.action!r})"
 
 
-class Frontier:
+class IndexedPriorityQueue:
+    """Binary min-heap of cell indices with O(log n) priority updates
+
+    ``positions`` maps every queued key to its slot in ``heap``, so
+    membership checks need no scan and pushing a queued key again moves
+    it in place (decrease-key) instead of adding a duplicate entry.
+    Priorities only need to support ``<``; tuples are used for
+    tie-breaking.
+    """
+
     def __init__(self) -> None:
-        self.frontier: list[Node] = []
+        self.heap: list[int] = []
+        self.priorities: dict[int, Any] = {}
+        self.positions: dict[int, int] = {}
+
+    def push(self, key: int, priority: Any) -> None:
+        """Insert a key or update the priority of a queued one
+
+        Args:
+            key (int): Cell index
+            priority (Any): New priority
+        """
+        if key in self.positions:
+            old = self.priorities[key]
+            self.priorities[key] = priority
+            if priority < old:
+                self._sift_up(self.positions[key])
+            else:
+                self._sift_down(self.positions[key])
+            return
+
+        self.priorities[key] = priority
+        self.positions[key] = len(self.heap)
+        self.heap.append(key)
+        self._sift_up(len(self.heap) - 1)
+
+    def pop(self) -> int:
+        if self.is_empty():
+            raise Exception("Empty Frontier")
+
+        heap = self.heap
+        key = heap[0]
+        last = heap.pop()
+        if heap:
+            heap[0] = last
+            self._sift_down(0)
 
-    def add(self, node: Node) -> None:
-        self.frontier.append(node)
+        del self.positions[key]
+        del self.priorities[key]
+        return key
 
-    def contains_state(self, state: tuple[int, int]) -> bool:
-        return any(node.state == state for node in self.frontier)
+    def remove(self, key: int) -> None:
+        index = self.positions.pop(key)
+        del self.priorities[key]
+
+        last = self.heap.pop()
+        if index < len(self.heap):
+            self.heap[index] = last
+            self._sift_up(index)
+            self._sift_down(self.positions[last])
+
+    def peek(self) -> int:
+        return self.heap[0]
+
+    def priority(self, key: int) -> Any:
+        return self.priorities[key]
 
     def is_empty(self) -> bool:
-        return len(self.frontier) == 0
+        return len(self.heap) == 0
+
+    def _sift_up(self, index: int) -> None:
+        heap, positions, priorities = self.heap, self.positions, self.priorities
+        key = heap[index]
+        priority = priorities[key]
+
+        while index > 0:
+            parent = (index - 1) >> 1
+            other = heap[parent]
+            if not priority < priorities[other]:
+                break
+
+            heap[index] = other
+            positions[other] = index
+            index = parent
+
+        heap[index] = key
+        positions[key] = index
+
+    def _sift_down(self, index: int) -> None:
+        heap, positions, priorities = self.heap, self.positions, self.priorities
+        size = len(heap)
+        key = heap[index]
+        priority = priorities[key]
+
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+
+            right = child + 1
+            if right < size and priorities[heap[right]] < priorities[heap[child]]:
+                child = right
+
+            other = heap[child]
+            if not priorities[other] < priority:
+                break
+
+            heap[index] = other
+            positions[other] = index
+            index = child
+
+        heap[index] = key
+        positions[key] = index
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self.positions
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}()"
 
-    def __str__(self) -> str:
-        return f"{self.__class__.__name__} => {self.frontier}"
 
-
-class StackFrontier(Frontier):
-    def remove(self) -> Node:
+class BucketQueue:
+    """Dial's bucket queue for small non-negative integer priorities
+
+    Keys are spread over a ring of buckets indexed by ``priority & mask``
+    and popped by advancing a cursor, so push and pop are O(1) as long as
+    queued priorities stay within the ring (Dijkstra-style searches only
+    ever queue priorities between the current minimum and that minimum
+    plus the largest cell cost). The ring doubles when a wider span is
+    needed. Updating a queued key leaves a stale entry behind that is
+    skipped when popped.
+    """
+
+    def __init__(self, span: int = 64) -> None:
+        size = 1
+        while size <= span:
+            size <<= 1
+
+        self.buckets: list[list[int]] = [[] for _ in range(size)]
+        self.priorities: dict[int, int] = {}
+        self.cursor = 0
+        self.top = 0
+
+    def push(self, key: int, priority: int) -> None:
+        """Insert a key or update the priority of a queued one
+
+        Args:
+            key (int): Cell index
+            priority (int): New priority
+        """
+        if not self.priorities:
+            self.cursor = self.top = priority
+        elif priority < self.cursor or priority > self.top:
+            low = min(self.cursor, priority)
+            high = max(self.top, priority)
+            if high - low >= len(self.buckets):
+                self._grow(high - low)
+            self.cursor, self.top = low, high
+
+        self.priorities[key] = priority
+        self.buckets[priority & (len(self.buckets) - 1)].append(key)
+
+    def pop(self) -> int:
         if self.is_empty():
             raise Exception("Empty Frontier")
-        else:
-            return self.frontier.pop()
 
+        buckets, priorities = self.buckets, self.priorities
+        mask = len(buckets) - 1
+        while True:
+            bucket = buckets[self.cursor & mask]
+            while bucket:
+                key = bucket.pop()
+                if priorities.get(key) == self.cursor:
+                    del priorities[key]
+                    return key
 
-class QueueFrontier(Frontier):
-    def remove(self) -> Node:
-        if self.is_empty():
-            raise Exception("Empty Frontier")
-        else:
-            return self.frontier.pop(0)
+            self.cursor += 1
+
+    def remove(self, key: int) -> None:
+        del self.priorities[key]
+
+    def priority(self, key: int) -> int:
+        return self.priorities[key]
+
+    def is_empty(self) -> bool:
+        return len(self.priorities) == 0
+
+    def _grow(self, span: int) -> None:
+        size = len(self.buckets)
+        while size <= span:
+            size <<= 1
+
+        self.buckets = [[] for _ in range(size)]
+        for key, priority in self.priorities.items():
+            self.buckets[priority & (size - 1)].append(key)
+
+    def __len__(self) -> int:
+        return len(self.priorities)
 
+    def __contains__(self, key: int) -> bool:
+        return key in self.priorities
 
-class PriorityQueueFrontier(Frontier):
-    def __init__(self):
-        self.frontier: list[tuple[int, Node]] = []
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}()"
+
+
+# Direction bits of the adjacency index
+UP, DOWN, LEFT, RIGHT = 1, 2, 4, 8
+
+MASK_64 = (1 << 64) - 1
 
-    def add(self, node: Node, priority: int = 0) -> None:
-        heappush(self.frontier, (priority, node))
+# Distance of cells a search has not reached, the largest array("i") value
+UNREACHED = 2 ** 31 - 1
 
-    def get(self, state: tuple[int, int]) -> Node | None:
-        for _, node in self.frontier:
-            if node.state == state:
-                return node
 
-        return None
+def zobrist(index: int, cost: int, wall: bool) -> int:
+    """64-bit key of one cell state, mixed with the splitmix64 finalizer
 
-    def pop(self) -> Node:
-        _, node = heappop(self.frontier)
-        return node
+    XOR-ing the keys of all cells gives the grid fingerprint; an edit
+    swaps one key for another, so the fingerprint updates in O(1).
+    """
+    key = ((index << 33) | ((cost & 0xFFFFFFFF) << 1) | wall) & MASK_64
+    key = (key + 0x9E3779B97F4A7C15) & MASK_64
+    key = ((key ^ (key >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    key = ((key ^ (key >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return key ^ (key >> 31)
 
 
 class Grid:
@@ -92,10 +270,159 @@ class Grid:
         end: tuple[int, int]
     ) -> None:
         self.grid: list[list[Node]] = grid
+        self._setup(
+            max(len(row) for row in grid),
+            len(grid),
+            array("i", (node.cost for row in grid for node in row)),
+            bytearray(node.value == "#" for row in grid for node in row),
+            start,
+            end,
+        )
+
+    def _setup(
+        self,
+        width: int,
+        height: int,
+        costs: array,
+        walls: bytearray,
+        start: tuple[int, int],
+        end: tuple[int, int]
+    ) -> None:
+        """Set the buffers and state shared by every grid backend"""
+        self.width = width
+        self.height = height
+        self.costs = costs
+        self.walls = walls
         self.start = start
         self.end = end
-        self.width = max(len(row) for row in grid)
-        self.height = len(grid)
+        self.build_index()
+
+        # Data derived from the grid by searches, e.g. cluster abstractions,
+        # and callbacks told about every changed cell index. version counts
+        # the edits so derived data can tell whether it is stale
+        self.version = 0
+        self._fingerprint: int | None = None
+        self.cache: dict[str, Any] = {}
+        self.listeners: list[Callable[[int], None]] = []
+
+    def build_index(self) -> None:
+        """Precompute the adjacency index
+
+        ``moves[index]`` holds a bitmask of the open directions of a cell
+        and ``steps[mask]`` lists the ``(action, offset)`` pairs of that
+        mask, so searches can walk neighbours as
+        ``index + offset for _, offset in steps[moves[index]]``.
+        """
+        width = self.width
+        offsets = (("up", UP, -width), ("down", DOWN, width),
+                   ("left", LEFT, -1), ("right", RIGHT, 1))
+
+        self.steps = tuple(
+            tuple((action, offset)
+                  for action, bit, offset in offsets if mask & bit)
+            for mask in range(16)
+        )
+        self.moves = bytearray(self.width * self.height)
+        for index in range(self.width * self.height):
+            self.moves[index] = self._mask(index)
+
+    def _mask(self, index: int) -> int:
+        row, col = divmod(index, self.width)
+        walls = self.walls
+
+        mask = 0
+        if row > 0 and not walls[index - self.width]:
+            mask |= UP
+        if row < self.height - 1 and not walls[index + self.width]:
+            mask |= DOWN
+        if col > 0 and not walls[index - 1]:
+            mask |= LEFT
+        if col < self.width - 1 and not walls[index + 1]:
+            mask |= RIGHT
+
+        return mask
+
+    def _update(self, index: int, cost: int, wall: bool) -> bool:
+        if self.costs[index] == cost and self.walls[index] == wall:
+            return False
+
+        if self._fingerprint is not None:
+            self._fingerprint ^= zobrist(index, self.costs[index], self.walls[index]) \
+                ^ zobrist(index, cost, wall)
+
+        self.costs[index] = cost
+        if self.walls[index] != wall:
+            self.walls[index] = wall
+
+            # Only the cells around a toggled wall change their masks
+            row, col = divmod(index, self.width)
+            for r, c in ((row - 1, col), (row + 1, col),
+                         (row, col - 1), (row, col + 1)):
+                if 0 <= r < self.height and 0 <= c < self.width:
+                    self.moves[r * self.width + c] = self._mask(
+                        r * self.width + c)
+
+        self.version += 1
+        for listener in self.listeners:
+            listener(index)
+
+        return True
+
+    def refresh(self, pos: tuple[int, int]) -> bool:
+        """Sync the adjacency index after a node was edited
+
+        Args:
+            pos (tuple[int, int]): Position of the edited node
+
+        Returns:
+            bool: Whether the cost or the wall flag of the cell changed
+        """
+        node = self.grid[pos[0]][pos[1]]
+        return self._update(self.index(pos), node.cost, node.value == "#")
+
+    @property
+    def size(self) -> int:
+        return self.width * self.height
+
+    @property
+    def fingerprint(self) -> int:
+        """Zobrist hash of the costs and walls, kept up to date by edits
+
+        Computed in O(cells) on first use only; every edit after that
+        updates it in O(1).
+        """
+        if self._fingerprint is None:
+            costs, walls = self.costs, self.walls
+            fingerprint = 0
+            for index in range(self.size):
+                fingerprint ^= zobrist(index, costs[index], walls[index])
+            self._fingerprint = fingerprint
+
+        return self._fingerprint
+
+    def index(self, pos: tuple[int, int]) -> int:
+        return pos[0] * self.width + pos[1]
+
+    def position(self, index: int) -> tuple[int, int]:
+        return divmod(index, self.width)
+
+    def walk_back(self, parents: array, index: int) -> list[int]:
+        """Follow a search's parent array back to its root
+
+        Args:
+            parents (array): Parent index of every cell, -1 for the root
+            index (int): Cell to start from
+
+        Returns:
+            list[int]: Cell indices from the root to ``index``
+        """
+        cells = []
+        while index != -1:
+            cells.append(index)
+            index = parents[index]
+
+        cells.reverse()
+        return cells
 
     def get_node(self, pos: tuple[int, int]) -> Node:
         return self.grid[pos[0]][pos[1]]
@@ -104,7 +431,6 @@ class Grid:
         try:
             return self.grid[pos[0]][pos[1]].cost
         except IndexError:
-            print(f"IndexError: {pos}")
             return 999999
 
     def get_neighbours(
@@ -112,42 +438,133 @@ class Grid:
         pos: tuple[int, int]
     ) -> dict[str, tuple[int, int]]:
 
+        index = pos[0] * self.width + pos[1]
+
+        return {action: divmod(index + offset, self.width)
+                for action, offset in self.steps[self.moves[index]]}
+
+    def __repr__(self) -> str:
+        return f"Grid([[...], ...], {self.start}, {self.end})"
+
+
+class CompactGrid(Grid):
+    """Grid backend storing costs and walls in flat buffers
+
+    Cell ``(row, col)`` lives at index ``row * width + col`` of both
+    ``costs`` and ``walls``, so no per-cell ``Node`` objects are kept.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        costs: array,
+        walls: bytearray,
+        start: tuple[int, int],
+        end: tuple[int, int]
+    ) -> None:
+        if len(costs) != width * height or len(walls) != width * height:
+            raise ValueError("Buffers do not match grid dimensions")
+
+        self._setup(width, height, costs, walls, start, end)
+
+    @classmethod
+    def from_grid(cls, grid: Grid) -> CompactGrid:
+        compact = cls(grid.width, grid.height, array("i", grid.costs),
+                      bytearray(grid.walls), grid.start, grid.end)
+        compact._fingerprint = grid._fingerprint
+        return compact
+
+    def set_cell(self, pos: tuple[int, int], cost: int, wall: bool = False) -> bool:
+        """Update a cell and its entries in the adjacency index
+
+        Args:
+            pos (tuple[int, int]): Position of the cell
+            cost (int): New cell cost
+            wall (bool, optional): Whether the cell is a wall. Defaults to False.
+
+        Returns:
+            bool: Whether the cell changed
+        """
+        return self._update(self.index(pos), cost, wall)
+
+    def get_node(self, pos: tuple[int, int]) -> Node:
+        index = self.index(pos)
+        return Node("#" if self.walls[index] else "", pos, self.costs[index])
+
+    def get_cost(self, pos: tuple[int, int]) -> int:
         row, col = pos
+        if not (0 <= row < self.height and 0 <= col < self.width):
+            return 999999
 
-        action_pos_mapper = {
-            "up": (row - 1, col),
-            "down": (row + 1, col),
-            "left": (row, col - 1),
-            "right": (row, col + 1),
-            # "upleft": (row - 1, col - 1),
-            # "upright": (row - 1, col + 1),
-            # "downleft": (row + 1, col - 1),
-            # "downright": (row + 1, col + 1),
-        }
+        return self.costs[row * self.width + col]
+
+    def __repr__(self) -> str:
+        return f"CompactGrid({self.width}x{self.height}, {self.start}, {self.end})"
+
+
+class Cells(Sequence):
+    """Read-only sequence of (row, col) positions packed as cell indices
+
+    Indices take four bytes each in an ``array("i")``; the position
+    tuples are only built while indexing or iterating.
+    """
+
+    __slots__ = ("indices", "width")
+
+    def __init__(self, indices: array, width: int) -> None:
+        self.indices = indices
+        self.width = width
 
-        possible_actions = {}
-        for action, (r, c) in action_pos_mapper.items():
-            print('---------------------------')
-            print(action, (r, c), self.get_cost((r, c)))
-            if not (0 <= r < self.height and 0 <= c < self.width):
-                continue
+    def __len__(self) -> int:
+        return len(self.indices)
 
-            if self.grid[r][c].value == "#":
-                continue
+    @overload
+    def __getitem__(self, item: int) -> tuple[int, int]: ...
 
-            possible_actions[action] = (r, c)
+    @overload
+    def __getitem__(self, item: slice) -> Cells: ...
 
-        return possible_actions
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return Cells(self.indices[item], self.width)
+
+        return divmod(self.indices[item], self.width)
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        width = self.width
+        for index in self.indices:
+            yield divmod(index, width)
+
+    def __contains__(self, position: object) -> bool:
+        if not isinstance(position, tuple) or len(position) != 2:
+            return False
+
+        row, col = position
+        if not 0 <= col < self.width:
+            return False
+        return row * self.width + col in self.indices
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Cells):
+            return self.width == other.width and self.indices == other.indices
+        if isinstance(other, Sequence):
+            return len(self) == len(other) and all(
+                cell == position for cell, position in zip(self, other))
+
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
 
     def __repr__(self) -> str:
-        return f"Grid([[...], ...], {self.start}, {self.end})"
+        return f"Cells({list(self)!r})"
 
 
 class Solution:
     def __init__(
         self,
-        path: list[tuple[int, int]],
-        explored: list[tuple[int, int]],
+        path: Sequence[tuple[int, int]],
+        explored: Sequence[tuple[int, int]],
         time: float = 0,
         path_cost: int = 0
     ) -> None:
@@ -158,6 +575,46 @@ class Solution:
         self.explored_length = len(explored)
         self.time = time
 
+    @classmethod
+    def from_indices(
+        cls,
+        grid: Grid,
+        path: Iterable[int],
+        explored: Iterable[int],
+    ) -> Solution:
+        """Build a solution that keeps the cells as packed indices
+
+        Args:
+            grid (Grid): Grid that was searched
+            path (Iterable[int]): Cell indices of the path, start first
+            explored (Iterable[int]): Cell indices in the order they were explored
+
+        Returns:
+            Solution: Solution whose path and explored are ``Cells`` views
+        """
+        path = path if isinstance(path, array) else array("i", path)
+        explored = explored if isinstance(explored, array) else array("i", explored)
+
+        costs = grid.costs
+        return cls(
+            Cells(path, grid.width),
+            Cells(explored, grid.width),
+            path_cost=sum(costs[index] for index in path[1:]),
+        )
+
+    def summary(self) -> dict[str, float]:
+        """Counts, cost and time without the cells
+
+        Returns:
+            dict[str, float]: Metrics in the format of the results table
+        """
+        return {
+            "explored_length": self.explored_length,
+            "path_length": self.path_length,
+            "path_cost": self.path_cost,
+            "time": self.time,
+        }
+
     def __repr__(self) -> str:
         return (f"Solution([{self.path[0]}, ..., {self.path[-1]}],"
                 f" {'{...}'}, {self.time})")
@@ -165,12 +622,19 @@ class Solution:
 
 class NoSolution(Solution):
     def __repr__(self) -> str:
-        explored = list(self.explored)
-        return (f"NoSolution([], {'{'}{explored[0]}, {explored[1]},"
+        explored = list(self.explored[:2])
+        return (f"NoSolution([], {'{'}{', '.join(map(str, explored))},"
                 f" ...{'}'}, {self.time})")
 
 
 class Search(Enum):
     BREADTH_FIRST_SEARCH = "BFS"
     LOCAL_BEAM_SEARCH = "LBS"
-    GREEDY_BEST_FIRST_SEARCH = "GBFS"
\ No newline at end of file
+    GREEDY_BEST_FIRST_SEARCH = "GBFS"
+    DIJKSTRA = "DIJKSTRA"
+    A_STAR = "A*"
+    BIDIRECTIONAL_BFS = "BBFS"
+    JUMP_POINT_SEARCH = "JPS"
+    HIERARCHICAL_A_STAR = "HPA*"
+    D_STAR_LITE = "D*LITE"
+    WAVEFRONT_BFS = "WBFS"
\ No newline at end of file
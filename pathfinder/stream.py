@@ -0,0 +1,154 @@
+"""Incremental searches
+
+A streaming search is a generator that yields the index of every cell as
+it is explored and returns the ``Solution`` when it stops. ``SearchStream``
+wraps one for callers that want positions as they happen, e.g. to start
+animating before the search is over or to stop it early.
+"""
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Callable, Generator, Iterator
+
+from .models import Cells, Grid, Solution
+
+CellStream = Generator[int, None, Solution]
+
+
+def drain(cells: CellStream) -> Solution:
+    """Run a streaming search to the end
+
+    Args:
+        cells (CellStream): Streaming search
+
+    Returns:
+        Solution: What the search returned
+    """
+    solution = None
+
+    def collect() -> Generator[int, None, None]:
+        nonlocal solution
+        solution = yield from cells
+
+    # deque chạy hết generator trong C, không tạo danh sách trung gian
+    deque(collect(), maxlen=0)
+    return solution  # type: ignore[return-value]
+
+
+def replay(grid: Grid, solve: Callable[[], Solution]) -> CellStream:
+    """Stream a search that can only run in one go
+
+    The search runs on the first step and its explored cells are then
+    yielded one by one.
+
+    Args:
+        grid (Grid): Grid being searched
+        solve (Callable[[], Solution]): Runs the search
+
+    Returns:
+        CellStream: Streaming search with the same solution
+    """
+    solution = solve()
+    if isinstance(solution.explored, Cells):
+        yield from solution.explored.indices
+    else:
+        for position in solution.explored:
+            yield grid.index(position)
+
+    return solution
+
+
+class SearchStream:
+    """Positions of the cells a search explores, in order
+
+    The search only advances while the stream is iterated. Once it is
+    exhausted ``solution`` holds the result, with ``time`` counting only
+    the time spent searching, not the time between steps. Iterating runs
+    the search ahead of the caller by at most ``batch`` cells.
+    """
+
+    batch = 256
+
+    def __init__(
+        self,
+        grid: Grid,
+        cells: CellStream,
+        on_finish: Callable[[Solution], None] | None = None,
+        timed: bool = True,
+    ) -> None:
+        self.grid = grid
+        self.cells = cells
+        self.on_finish = on_finish
+        self.timed = timed
+        self.time = 0.0
+        self.solution: Solution | None = None
+        self.closed = False
+
+    @property
+    def done(self) -> bool:
+        return self.solution is not None or self.closed
+
+    def take(self, count: int) -> list[tuple[int, int]]:
+        """Advance the search by up to count explored cells
+
+        Args:
+            count (int): Largest number of cells to return
+
+        Returns:
+            list[tuple[int, int]]: Positions explored, fewer than count once the search stops
+        """
+        positions: list[tuple[int, int]] = []
+        if self.done or count <= 0:
+            return positions
+
+        append, position, cells = positions.append, self.grid.position, self.cells
+        solution = None
+        start_time = time.perf_counter()
+        try:
+            for _ in range(count):
+                append(position(next(cells)))
+        except StopIteration as stop:
+            solution = stop.value
+        self.time += (time.perf_counter() - start_time) * 1000
+
+        if solution is not None:
+            self._finish(solution)
+        return positions
+
+    def run(self) -> Solution | None:
+        """Run the rest of the search
+
+        Returns:
+            Solution | None: The solution, None when the stream was closed
+        """
+        if not self.done:
+            start_time = time.perf_counter()
+            solution = drain(self.cells)
+            self.time += (time.perf_counter() - start_time) * 1000
+            self._finish(solution)
+
+        return self.solution
+
+    def close(self) -> None:
+        """Stop the search, leaving ``solution`` unset"""
+        if not self.done:
+            self.cells.close()
+            self.closed = True
+
+    def _finish(self, solution: Solution) -> None:
+        if self.timed:
+            solution.time = self.time
+        self.solution = solution
+        if self.on_finish:
+            self.on_finish(solution)
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        # Lấy theo lô để không phải đo thời gian cho từng ô
+        while not self.done:
+            yield from self.take(self.batch)
+
+    def __repr__(self) -> str:
+        state = "done" if self.solution is not None else (
+            "closed" if self.closed else "running")
+        return f"SearchStream({state}, {self.time:.2f}ms)"
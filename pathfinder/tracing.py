@@ -0,0 +1,104 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from collections import deque
+from enum import Enum
+from typing import Callable, TextIO
+
+
+class TraceEvent(Enum):
+    EXPAND = "expand"
+    GENERATE = "generate"
+    GOAL = "goal"
+
+
+class TraceSink(ABC):
+    """Receives search events while attached
+
+    Searches look the active sink up once per run and skip every hook
+    when none is attached, so tracing costs nothing when disabled.
+    """
+
+    @abstractmethod
+    def emit(self, event: TraceEvent, state: tuple[int, int]) -> None:
+        pass
+
+    def expand(self, state: tuple[int, int]) -> None:
+        self.emit(TraceEvent.EXPAND, state)
+
+    def generate(self, state: tuple[int, int]) -> None:
+        self.emit(TraceEvent.GENERATE, state)
+
+    def goal(self, state: tuple[int, int]) -> None:
+        self.emit(TraceEvent.GOAL, state)
+
+    def close(self) -> None:
+        pass
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}()"
+
+
+class CallbackSink(TraceSink):
+    def __init__(
+        self,
+        callback: Callable[[TraceEvent, tuple[int, int]], None]
+    ) -> None:
+        self.callback = callback
+
+    def emit(self, event: TraceEvent, state: tuple[int, int]) -> None:
+        self.callback(event, state)
+
+
+class RingBufferSink(TraceSink):
+    """Keep the most recent events in memory"""
+
+    def __init__(self, capacity: int = 65536) -> None:
+        self.events: deque[tuple[TraceEvent, tuple[int, int]]] = deque(
+            maxlen=capacity)
+
+    def emit(self, event: TraceEvent, state: tuple[int, int]) -> None:
+        self.events.append((event, state))
+
+    def clear(self) -> None:
+        self.events.clear()
+
+
+class FileSink(TraceSink):
+    """Write one ``<event> <row> <col>`` line per event to a buffered file"""
+
+    def __init__(self, path: str, buffering: int = 1 << 16) -> None:
+        self.file: TextIO = open(path, "w", buffering=buffering)
+
+    def emit(self, event: TraceEvent, state: tuple[int, int]) -> None:
+        self.file.write(f"{event.value} {state[0]} {state[1]}\n")
+
+    def close(self) -> None:
+        self.file.close()
+
+
+_sink: TraceSink | None = None
+
+
+def attach(sink: TraceSink) -> None:
+    """Route events of every following search to a sink
+
+    Args:
+        sink (TraceSink): Sink receiving the events
+    """
+    global _sink
+    _sink = sink
+
+
+def detach() -> TraceSink | None:
+    """Stop tracing
+
+    Returns:
+        TraceSink | None: The sink that was attached
+    """
+    global _sink
+    sink, _sink = _sink, None
+    return sink
+
+
+def active() -> TraceSink | None:
+    return _sink
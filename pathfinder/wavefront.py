@@ -0,0 +1,103 @@
+"""Breadth-first wavefront expanded with NumPy
+
+NumPy is optional: without it ``WavefrontSearch`` falls back to the plain
+``BreadthFirstSearch``.
+"""
+from __future__ import annotations
+
+from array import array
+
+from . import tracing
+from .bfs import BreadthFirstSearch
+from .models import DOWN, LEFT, RIGHT, UP, Grid, NoSolution, Solution
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+
+def wavefront(grid: Grid, stop: int = -1) -> tuple:
+    """Step counts and parents of every cell reachable from the start
+
+    Each round expands a whole BFS layer at once: the open directions of
+    the layer come from the adjacency index, and the not yet reached
+    targets of every direction are written in one vectorised step. Work
+    per round is proportional to the layer, not to the grid.
+
+    Args:
+        grid (Grid): Grid to expand
+        stop (int, optional): Stop after the layer holding this cell. Defaults to -1.
+
+    Returns:
+        tuple: ``(distances, parents, layers)`` as NumPy arrays, -1 where unreached
+    """
+    width = grid.width
+    start = grid.index(grid.start)
+    moves = np.frombuffer(grid.moves, dtype=np.uint8)
+
+    distances = np.full(grid.size, -1, dtype=np.intp)
+    parents = np.full(grid.size, -1, dtype=np.intp)
+    distances[start] = 0
+
+    frontier = np.array([start], dtype=np.intp)
+    layers = []
+    depth = 0
+
+    while frontier.size:
+        layers.append(frontier)
+        if stop != -1 and distances[stop] != -1:
+            break
+
+        depth += 1
+        masks = moves[frontier]
+        reached = []
+        for bit, offset in ((UP, -width), (DOWN, width), (LEFT, -1), (RIGHT, 1)):
+            # Mỗi hướng là một phép dịch cố định nên các đích không trùng
+            # nhau; ghi lần lượt từng hướng để loại ô đã được hướng trước chạm tới
+            cells = frontier[(masks & bit) != 0]
+            targets = cells + offset
+            fresh = distances[targets] == -1
+
+            targets = targets[fresh]
+            distances[targets] = depth
+            parents[targets] = cells[fresh]
+            reached.append(targets)
+
+        frontier = np.concatenate(reached)
+
+    return distances, parents, layers
+
+
+class WavefrontSearch:
+    @staticmethod
+    def search(grid: Grid, _: int = 3) -> Solution:
+        if np is None:
+            return BreadthFirstSearch.search(grid)
+
+        goal = grid.index(grid.end)
+        _, parents, layers = wavefront(grid, stop=goal)
+
+        # Chép thẳng bộ đệm NumPy sang mảng chỉ số, không tạo tuple cho từng ô
+        explored = array("i")
+        explored.frombytes(np.concatenate(layers).astype(np.intc).tobytes())
+
+        trace = tracing.active()
+        if trace:
+            for index in explored:
+                trace.expand(grid.position(index))
+
+        if parents[goal] == -1 and goal != grid.index(grid.start):
+            return NoSolution.from_indices(grid, [], explored)
+
+        path = []
+        cell = goal
+        while cell != -1:
+            path.append(cell)
+            cell = int(parents[cell])
+        path.reverse()
+
+        if trace:
+            trace.goal(grid.end)
+
+        return Solution.from_indices(grid, path, explored)